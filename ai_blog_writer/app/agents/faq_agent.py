@@ -1,11 +1,71 @@
 # ai_blog_writer\app\agents\faq_agent.py 
 import logging
-import json
+import orjson
+import re
+import asyncio
+import itertools
+import zlib
 from typing import List, Dict, Any, Optional
+import numpy as np
 from ..clients.ai_clients import gemini_client
+from ..core.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Lazily yields sentences so the fallback path stops scanning after max_faqs
+_SENT_RE = re.compile(r"[^.!?]+[.!?]+")
+
+# Local near-duplicate fingerprint: hashed counts of longer words and word bigrams
+# over the tag-stripped text. No network call, and reposts/reformatted variants of a
+# blog (same wording, different markup or small edits) land close together.
+_FP_TAG_RE = re.compile(r"<[^>]+>")
+_FP_WORD_RE = re.compile(r"\w+")
+_FP_DIM = 2048
+
+
+def _fingerprint(blog_content: str) -> np.ndarray:
+    words = _FP_WORD_RE.findall(_FP_TAG_RE.sub(" ", blog_content[:12000]).lower())
+    features = [w for w in words if len(w) > 3]
+    features += [f"{a} {b}" for a, b in zip(words, words[1:])]
+    buckets = np.fromiter(
+        (zlib.crc32(f.encode("utf-8")) % _FP_DIM for f in features),
+        dtype=np.int64,
+        count=len(features),
+    )
+    return np.bincount(buckets, minlength=_FP_DIM).astype(np.float32)
+
+# Static instructions, sent once through a Gemini context cache when possible
+FAQ_SYSTEM_INSTRUCTION = """
+You are a professional content writer. Based on the blog content you are given, generate FAQs.
+Each FAQ should include a clear question and a concise answer suitable for a reader.
+Incorporate the requested keywords where relevant and write in the requested language.
+Output as JSON in this format:
+[
+    {
+        "question": "FAQ question here",
+        "answer": "Concise answer here",
+        "tags": ["optional keyword tags"],
+        "language": "language code"
+    }
+]
+"""
+
+# Per-blog request; variable blog content last
+FAQ_REQUEST_TEMPLATE = """
+Generate up to {max_faqs} FAQs.
+Keywords: {keywords_text}
+Language: {language}
+
+Blog Content:
+{blog_content}
+"""
+
+# Inline form used when no context cache is available (instruction braces escaped for str.format)
+FAQ_PROMPT_TEMPLATE = (
+    FAQ_SYSTEM_INSTRUCTION.replace("{", "{{").replace("}", "}}") + FAQ_REQUEST_TEMPLATE
+)
+
+
 class FAQAgent:
     """
     Generates FAQs based on completed blog content.
@@ -16,13 +76,16 @@ class FAQAgent:
         self.clients = {
             "gemini": gemini_client
         }
+        # Near-duplicate blogs (reposts, reformatted variants) of the same owner reuse earlier FAQs
+        self._faq_cache = SemanticCache(threshold=0.9, maxsize=2048)
 
     async def generate_faqs(
         self,
         blog_content: str,
         target_keywords: Optional[List[str]] = None,
         max_faqs: int = 7,
-        language: str = "en"
+        language: str = "en",
+        scope: str = "",
     ) -> List[Dict[str, Any]]:
         """
         Generate FAQs for a blog.
@@ -32,45 +95,56 @@ class FAQAgent:
         - target_keywords: optional keywords to focus on
         - max_faqs: maximum number of FAQs to generate
         - language: language for the questions and answers
+        - scope: owner of the blog (user or site); cached FAQs are only reused within it
         
         Returns:
         - List of dictionaries, each with 'question', 'answer', and optional metadata
         """
         try:
+            namespace = f"{scope}|{language}"
+            fingerprint = _fingerprint(blog_content)
+            if fingerprint.any():
+                cached_faqs = self._faq_cache.lookup(fingerprint, namespace=namespace)
+                if cached_faqs is not None:
+                    logger.info("FAQ near-duplicate cache hit")
+                    return [
+                        {**faq, "language": language} for faq in cached_faqs[:max_faqs]
+                    ]
+
             keywords_text = ", ".join(target_keywords) if target_keywords else "general"
 
-            prompt = f"""
-            You are a professional content writer. Based on the following blog content, generate up to {max_faqs} FAQs.
-            Each FAQ should include a clear question and a concise answer suitable for a reader.
-            Make sure FAQs incorporate the following keywords where relevant: {keywords_text}.
-            Output as JSON in this format:
-            [
-                {{
-                    "question": "FAQ question here",
-                    "answer": "Concise answer here",
-                    "tags": ["optional keyword tags"],
-                    "language": "{language}"
-                }}
-            ]
-
-            Blog Content:
-            {blog_content}
-            """
-
-            response = await gemini_client.generate_structured(prompt=prompt)
+            cached_content = await gemini_client.get_cached_content(
+                "faq.v1", FAQ_SYSTEM_INSTRUCTION
+            )
+            template = FAQ_REQUEST_TEMPLATE if cached_content else FAQ_PROMPT_TEMPLATE
+            prompt = template.format(
+                max_faqs=max_faqs,
+                keywords_text=keywords_text,
+                language=language,
+                blog_content=blog_content,
+            )
+
+            response = await gemini_client.generate_structured(
+                prompt=prompt, cached_content=cached_content
+            )
 
             if not response:
                 logger.warning("FAQ generation returned empty. Using fallback FAQs.")
                 return self._generate_fallback_faqs(blog_content, target_keywords, max_faqs, language)
 
             if isinstance(response, str):
-                faqs = json.loads(response)
+                faqs = orjson.loads(response)
             else:
                 faqs = response
 
             # Ensure language field
             for faq in faqs:
-                faq["language"] = faq.get("language", language)
+                faq.setdefault("language", language)
+
+            if fingerprint.any() and isinstance(faqs, list) and faqs:
+                self._faq_cache.add(
+                    fingerprint, [dict(faq) for faq in faqs], namespace=namespace
+                )
 
             return faqs
 
@@ -78,6 +152,33 @@ class FAQAgent:
             logger.error(f"FAQ generation failed: {str(e)}")
             return self._generate_fallback_faqs(blog_content, target_keywords, max_faqs, language)
 
+    async def generate_faqs_batch(
+        self,
+        blogs: List[Dict[str, Any]],
+        max_concurrency: int = 32
+    ) -> List[Any]:
+        """
+        Generate FAQs for several blogs concurrently.
+
+        Parameters:
+        - blogs: list of keyword-argument dicts for `generate_faqs`
+          (blog_content, target_keywords, max_faqs, language, scope)
+        - max_concurrency: upper bound on in-flight Gemini requests
+
+        Returns:
+        - One FAQ list per blog, in input order. An entry is the raised
+          exception if that blog failed outright.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _generate_one(blog: Dict[str, Any]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self.generate_faqs(**blog)
+
+        return await asyncio.gather(
+            *(_generate_one(blog) for blog in blogs), return_exceptions=True
+        )
+
     def _generate_fallback_faqs(
         self,
         blog_content: str,
@@ -90,14 +191,14 @@ class FAQAgent:
         Splits content into sentences and creates generic questions.
         """
         faqs = []
-        sentences = blog_content.split(". ")
-        for i, sentence in enumerate(sentences[:max_faqs]):
+        default_tags = target_keywords[:3] if target_keywords else []
+        sentences = (m.group(0).strip() for m in _SENT_RE.finditer(blog_content))
+        for i, sentence in enumerate(itertools.islice(sentences, max_faqs)):
             question = f"What is about {target_keywords[0]}?" if target_keywords else f"FAQ {i+1}"
-            answer = sentence.strip()
             faqs.append({
                 "question": question,
-                "answer": answer,
-                "tags": target_keywords[:3] if target_keywords else [],
+                "answer": sentence,
+                "tags": list(default_tags),
                 "language": language
             })
         return faqs
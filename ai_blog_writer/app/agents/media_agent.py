@@ -2,28 +2,106 @@
 import logging
 import asyncio
 import base64
-from typing import Dict, List, Any, Optional
+import hashlib
+import ipaddress
+import os
+import socket
+import tempfile
+import time
+from typing import Awaitable, Dict, List, Any, Optional
+from urllib.parse import urlsplit
 from googleapiclient.discovery import build
 
-from playwright.async_api import async_playwright
+try:
+    from playwright.async_api import async_playwright
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    _PLAYWRIGHT_AVAILABLE = False
+    PlaywrightTimeoutError = asyncio.TimeoutError
+else:
+    _PLAYWRIGHT_AVAILABLE = True
 import httpx
+import orjson
+from cachetools import TTLCache
 from typing import List, Dict, Any
 from ..clients.ai_clients import nano_banana_client
-from ..clients.cloudinary import upload_image
+from ..clients.cloudinary import find_image, upload_image
+from ..clients.http_client import http_client
 from shared_models.models import UserSettings
 from ..core.config import settings
-from urllib.parse import urlparse
+from ..middleware.rate_limiter import YOUTUBE_LIMITER
 
 logger = logging.getLogger(__name__)
 
-def is_valid_url(url: str) -> bool:
+# YouTube search results cached per (query, channels) for 6 hours
+_youtube_cache: TTLCache = TTLCache(maxsize=1024, ttl=6 * 60 * 60)
+
+# Uploaded screenshots are reused for a week, then the site is captured again
+SCREENSHOT_REFRESH_SECONDS = 7 * 24 * 60 * 60
+
+# Heavy assets skipped while loading pages for screenshots
+_SCREENSHOT_BLOCKED_RESOURCES = "**/*.{woff,woff2,ttf,otf,mp4,webm}"
+
+# Overlays stripped from pages before taking a screenshot
+_SCREENSHOT_SELECTORS_TO_REMOVE = [
+    ".popup",
+    ".modal",
+    ".advertisement",
+    ".cookie-banner",
+]
+_REMOVE_ELEMENTS_SCRIPT = """
+(selectors) => {
+    let removed = 0;
+    for (const selector of selectors) {
+        document.querySelectorAll(selector).forEach((el) => {
+            el.remove();
+            removed += 1;
+        });
+    }
+    return removed;
+}
+"""
+
+
+def _short_id(s: str) -> str:
+    """Stable short digest used for Cloudinary public IDs (unlike hash(), survives restarts)."""
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=8).hexdigest()
+
+
+async def warm_http_client() -> None:
+    """Open a pooled connection to googleapis ahead of the first YouTube lookup."""
+    await http_client.get("https://www.googleapis.com/generate_204")
+
+
+async def is_valid_url(url: str) -> bool:
+    """Screenshot-target check: http(s), no userinfo, and the host must resolve only to public addresses.
+
+    Every resolved address is checked, so numeric forms (127.1, 2130706433, 0x7f.1) and
+    DNS names pointing at private ranges are refused. The browser resolves again on
+    navigation, so this does not cover DNS rebinding.
+    """
+    if not url:
+        return False
     try:
-        result = urlparse(url)
-        return all([result.scheme in ("http", "https"), result.netloc])
-    except:
+        parts = urlsplit(url)
+        port = parts.port  # ValueError on a malformed port
+    except ValueError:
+        return False
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or "@" in parts.netloc:
+        return False
+    host = (parts.hostname or "").rstrip(".")
+    if not host:
         return False
 
-
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port or (443 if scheme == "https" else 80), type=socket.SOCK_STREAM
+        )
+    except (OSError, UnicodeError):
+        return False
+    addresses = {info[4][0].split("%", 1)[0] for info in infos}
+    return bool(addresses) and all(ipaddress.ip_address(a).is_global for a in addresses)
 
 
 class MediaAgent:
@@ -34,6 +112,12 @@ class MediaAgent:
     - YouTube video integration
     """
 
+    def __init__(self):
+        # Chromium is launched lazily and shared by all screenshot captures
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+
     async def generate_media_assets(
         self,
         headings: list[str],
@@ -48,58 +132,42 @@ class MediaAgent:
         Generate all media assets concurrently
         """
         try:
+            # Only schedule the features that are actually enabled
+            tasks: Dict[str, Awaitable[Any]] = {}
 
-            tasks = []
-
-            # Header image
             if user_prefs.allow_ai_images:
-                tasks.append(
-                    self._generate_header_image(
-                        headings, title, target_keyword, language, user_prefs
-                    )
+                tasks["header_image"] = self._generate_header_image(
+                    headings, title, target_keyword, language, user_prefs
                 )
-            else:
-                tasks.append(asyncio.sleep(0))
 
-            # Website screenshot
             if website_url:
-                tasks.append(self._capture_website_screenshot(website_url))
-            else:
-                tasks.append(asyncio.sleep(0))
+                tasks["website_screenshot"] = self._capture_website_screenshot(
+                    website_url
+                )
 
-            # YouTube videos
             if user_prefs.include_youtube_videos:
-                tasks.append(
-                    self._find_youtube_videos(
-                        title, target_keyword, task_id, user_prefs
-                    )
+                tasks["youtube_videos"] = self._find_youtube_videos(
+                    title, target_keyword, task_id, user_prefs
                 )
-            else:
-                tasks.append(asyncio.sleep(0))
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+            out = dict(zip(tasks.keys(), results))
 
-            header_image = (
-                results[0]
-                if not isinstance(results[0], Exception)
-                else {"status": "failed"}
-            )
-            screenshot = (
-                results[1]
-                if not isinstance(results[1], Exception)
-                else {"status": "failed"}
-            )
-            youtube_videos = results[2] if not isinstance(results[2], Exception) else []
+            header_image = out.get("header_image", {"status": "disabled"})
+            if isinstance(header_image, Exception):
+                header_image = {"status": "failed"}
+
+            screenshot = out.get("website_screenshot", {"status": "no_url"})
+            if isinstance(screenshot, Exception):
+                screenshot = {"status": "failed"}
+
+            youtube_videos = out.get("youtube_videos", [])
+            if isinstance(youtube_videos, Exception):
+                youtube_videos = []
 
             return {
-                "header_image": (
-                    header_image
-                    if user_prefs.allow_ai_images
-                    else {"status": "disabled"}
-                ),
-                "website_screenshot": (
-                    screenshot if website_url else {"status": "no_url"}
-                ),
+                "header_image": header_image,
+                "website_screenshot": screenshot,
                 "youtube_videos": youtube_videos[
                     : user_prefs.max_youtube_videos_per_post
                 ],
@@ -133,6 +201,18 @@ class MediaAgent:
 
             image_prompt = ". ".join(prompt_elements)
 
+            # Keyed on the full prompt (title, keyword, style, headings, custom prompt),
+            # so any change in what was asked for produces a new image
+            public_id = f"header_{_short_id(image_prompt)}"
+            image_url = await find_image(public_id, folder="blog-headers")
+            if image_url:
+                return {
+                    "url": image_url,
+                    "alt_text": f"Header image for {title}",
+                    "prompt": image_prompt,
+                    "status": "reused",
+                }
+
             # ---- Call Nano Banana ----
             image_response = await nano_banana_client.generate_image(
                 prompt=image_prompt
@@ -157,11 +237,16 @@ class MediaAgent:
 
             # ---- Safe to decode now ----
             image_data = parts[0]["inline_data"]["data"]
-            image_bytes = base64.b64decode(image_data)
+            if isinstance(image_data, (bytes, bytearray)):
+                # The genai SDK already hands back raw bytes; no base64 round-trip
+                image_bytes = bytes(image_data)
+            else:
+                # Large images take tens of ms to decode; keep that off the event loop
+                image_bytes = await asyncio.to_thread(base64.b64decode, image_data)
 
             image_url = await upload_image(
                 image_bytes,
-                f"header_{abs(hash(title))}",
+                public_id,
                 folder="blog-headers",
             )
 
@@ -182,56 +267,102 @@ class MediaAgent:
 
     async def _capture_website_screenshot(self, website_url: str) -> Dict[str, Any]:
         """Capture a screenshot of the website"""
-        try:
-            from playwright.async_api import async_playwright
-        except ImportError:
+        if not await is_valid_url(website_url):
+            logger.warning(f"Invalid website URL: {website_url}")
+            return {"status": "invalid_url"}
+
+        # One screenshot per site per time bucket; a new bucket triggers a fresh capture
+        bucket = int(time.time() // SCREENSHOT_REFRESH_SECONDS)
+        public_id = f"screenshot_{_short_id(website_url)}_{bucket}"
+        screenshot_url = await find_image(public_id, folder="website-screenshots")
+        if screenshot_url:
+            return {
+                "url": screenshot_url,
+                "original_url": website_url,
+                "alt_text": f"Screenshot of {website_url}",
+                "status": "reused",
+            }
+
+        if not _PLAYWRIGHT_AVAILABLE:
             logger.warning("Playwright not installed — skipping screenshot")
             return {"status": "unsupported_environment"}
 
         try:
-            async with async_playwright() as p:
-                if not is_valid_url(website_url):
-                    logger.warning(f"Invalid website URL: {website_url}")
-                    return {"status": "invalid_url"}
-
+            try:
+                browser = await self._get_browser()
+            except Exception as e:
+                logger.warning(f"Chromium launch failed: {e}")
+                return {"status": "unsupported_environment"}
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # Written straight to disk so the upload streams from a file path
+                screenshot_path = os.path.join(tmp_dir, "screenshot.jpg")
+
+                # Fresh context per URL keeps cookies/storage isolated between sites
+                context = await browser.new_context(viewport={"width": 1200, "height": 800})
                 try:
-                    browser = await p.chromium.launch(
-                        headless=True,
-                        args=[
-                            "--no-sandbox",
-                            "--disable-setuid-sandbox",
-                        ],
-                    )
-                except Exception as e:
-                    logger.warning(f"Chromium launch failed: {e}")
-                    return {"status": "unsupported_environment"}
-
-                try:
-                    context = await browser.new_context(viewport={"width": 1200, "height": 800})
+                    # Fonts and video don't matter for an above-the-fold JPEG
+                    await context.route(_SCREENSHOT_BLOCKED_RESOURCES, lambda route: route.abort())
                     page = await context.new_page()
-                    await page.goto(website_url, timeout=30000, wait_until="networkidle")
+                    await page.goto(website_url, timeout=15000, wait_until="domcontentloaded")
+                    try:
+                        await page.wait_for_load_state("load", timeout=5000)
+                    except PlaywrightTimeoutError:
+                        pass  # Slow third-party assets; the viewport is usually ready
                     await self._clean_page_for_screenshot(page)
 
-                    screenshot = await page.screenshot(full_page=False, quality=80, type="jpeg")
+                    await page.screenshot(
+                        path=screenshot_path, full_page=False, quality=80, type="jpeg"
+                    )
                 finally:
-                    await browser.close()
+                    await context.close()
 
                 screenshot_url = await upload_image(
-                    screenshot,
-                    f"screenshot_{abs(hash(website_url))}",
+                    screenshot_path,
+                    public_id,
                     folder="website-screenshots",
                 )
-                return {
-                    "url": screenshot_url,
-                    "original_url": website_url,
-                    "alt_text": f"Screenshot of {website_url}",
-                    "status": "captured",
-                }
+
+            return {
+                "url": screenshot_url,
+                "original_url": website_url,
+                "alt_text": f"Screenshot of {website_url}",
+                "status": "captured",
+            }
 
         except Exception as e:
             logger.error(f"Screenshot capture failed: {str(e)}", exc_info=True)
             return {"status": "failed"}
 
+    async def _get_browser(self):
+        """Launch Chromium once and reuse it across screenshot calls."""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        async with self._browser_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+
+            self._browser = await self._playwright.chromium.launch(
+                headless=True,
+                args=[
+                    "--no-sandbox",
+                    "--disable-setuid-sandbox",
+                ],
+            )
+            return self._browser
+
+    async def close(self) -> None:
+        """Shut down the shared browser and Playwright driver."""
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
 
     async def _find_youtube_videos(
         self, title: str, target_keyword: str, task_id: str, user_prefs: UserSettings
@@ -251,29 +382,39 @@ class MediaAgent:
                 "order": "relevance",
                 "videoEmbeddable": "true",
                 "safeSearch": "strict",
+                # Partial response: only the fields we read below
+                "fields": "items(id/videoId,snippet(title,description,channelTitle,publishedAt,thumbnails/high/url))",
                 "key": settings.youtube_api_key,
             }
 
             if user_prefs.preferred_youtube_channels:
                 params["channelId"] = ",".join(user_prefs.preferred_youtube_channels)
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
+            cache_key = hashlib.blake2b(
+                f"{query}|{params.get('channelId', '')}".encode("utf-8"),
+                digest_size=16,
+            ).digest()
+            cached = _youtube_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            async with YOUTUBE_LIMITER:
+                response = await http_client.get(
                     "https://www.googleapis.com/youtube/v3/search",
                     params=params,
-                    timeout=30.0,
                 )
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = orjson.loads(response.content)
 
             if "items" not in data or not data["items"]:
+                _youtube_cache[cache_key] = []
                 return []
 
             best_video = data["items"][0]
             snippet = best_video["snippet"]
             video_id = best_video["id"]["videoId"]
 
-            return [
+            videos = [
                 {
                     "video_id": video_id,
                     "title": snippet["title"],
@@ -285,6 +426,9 @@ class MediaAgent:
                     "status": "selected",
                 }
             ]
+            # Only successful responses are cached; errors fall through below
+            _youtube_cache[cache_key] = videos
+            return videos
 
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -298,17 +442,13 @@ class MediaAgent:
     async def _clean_page_for_screenshot(self, page) -> None:
         """Remove popups, modals, ads for screenshot"""
         try:
-            selectors_to_remove = [
-                ".popup",
-                ".modal",
-                ".advertisement",
-                ".cookie-banner",
-            ]
-            for selector in selectors_to_remove:
-                await page.evaluate(
-                    f"document.querySelectorAll('{selector}').forEach(el => el.remove())"
-                )
-            await asyncio.sleep(1)
+            # One CDP round-trip for all selectors
+            removed = await page.evaluate(
+                _REMOVE_ELEMENTS_SCRIPT, _SCREENSHOT_SELECTORS_TO_REMOVE
+            )
+            if removed:
+                # Give the layout a moment to settle after removals
+                await page.wait_for_timeout(100)
         except Exception as e:
             logger.debug(f"Page cleaning failed: {str(e)}")
 
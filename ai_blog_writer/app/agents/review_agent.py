@@ -1,11 +1,18 @@
-import json
+import orjson
 import logging
 import asyncio
 import re
 import base64
-from typing import Dict, List, Any, Optional
+import bisect
+import functools
+import hashlib
+import os
+from typing import Awaitable, Dict, List, Any, Optional, Tuple
 from pathlib import Path 
+import msgspec
+import numpy as np
 import textstat
+from cachetools import LRUCache
 from datetime import datetime
 
 import language_tool_python
@@ -14,38 +21,142 @@ from ..clients.supabase_client import supabase_client
 
 logger = logging.getLogger(__name__)
 
+# Retries and fallbacks re-review the same draft; memoize the local CPU-heavy checks
+_readability_cache: LRUCache = LRUCache(maxsize=1024)
+_grammar_cache: LRUCache = LRUCache(maxsize=1024)
+# Re-reviews of an unchanged draft skip the Gemini round trip entirely
+_llm_review_cache: LRUCache = LRUCache(maxsize=512)
 
-FACT_CHECK_PROMPT_TEMPLATE = """
-You are a fact-checking assistant. 
-Review the following blog content and compare it against the provided research data and verified facts. 
 
-Content:
-{content}
+# Flesch score buckets: _FLESCH_LABELS[i] covers scores in [_FLESCH_CUTS[i-1], _FLESCH_CUTS[i])
+_FLESCH_CUTS = (30, 50, 60, 70, 80, 90)
+_FLESCH_LABELS = (
+    "Very Difficult",
+    "Difficult",
+    "Fairly Difficult",
+    "Standard",
+    "Fairly Easy",
+    "Easy",
+    "Very Easy",
+)
 
-Research Data:
-{research_data}
+# Equal weights for readability, SEO, style and grammar in the quality score
+_QUALITY_SCORE_WEIGHTS = np.full(4, 0.25)
+
+_FACT_CHECK_FIELDS = ("corrections", "citations", "confidence_score")
+_FACT_CHECK_LIST_FIELDS = frozenset({"corrections", "citations"})
 
-Language: {language}
 
-Return a JSON object with:
-- corrections: list of objects with "original_text" and "corrected_text"
-- citations: list of URLs or references
-- confidence_score: number between 0-100
+# LanguageTool parallelism: server check threads and max chunks per document
+_GRAMMAR_WORKERS = os.cpu_count() or 4
+_GRAMMAR_MIN_CHUNK_CHARS = 2000
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n")
+
+
+def _split_for_grammar(content: str) -> List[Tuple[int, str]]:
+    """
+    Split content into (offset, text) chunks on paragraph breaks, packing
+    paragraphs so there are at most _GRAMMAR_WORKERS chunks and none is
+    smaller than _GRAMMAR_MIN_CHUNK_CHARS (short posts stay one chunk).
+    """
+    target = max(len(content) // _GRAMMAR_WORKERS, _GRAMMAR_MIN_CHUNK_CHARS)
+    if len(content) <= target:
+        return [(0, content)]
+
+    chunks = []
+    start = 0
+    for brk in _PARAGRAPH_BREAK_RE.finditer(content):
+        if brk.end() - start >= target:
+            chunks.append((start, content[start:brk.end()]))
+            start = brk.end()
+    if start < len(content):
+        chunks.append((start, content[start:]))
+    return chunks
+
+
+@functools.lru_cache(maxsize=256)
+def _keyword_re(keyword: str) -> re.Pattern:
+    """Compiled case-insensitive matcher, reused across reviews of the same campaign."""
+    return re.compile(re.escape(keyword), re.IGNORECASE)
+
+
+def _content_key(content: str, language: str) -> bytes:
+    return hashlib.blake2b(
+        f"{language}|{content}".encode("utf-8"), digest_size=16
+    ).digest()
+
+
+# Fact-checking and style review share the content, so they go out as one Gemini call.
+# Static instructions are served from a Gemini context cache when possible.
+REVIEW_SYSTEM_INSTRUCTION = """
+You are a fact-checking and editorial assistant.
+Review the blog content you are given: compare it against the provided research data and verified facts,
+and analyze it for style consistency, tone, and overall quality.
+
+Return a JSON object in this format:
+{
+    "fact_check": {
+        "corrections": [{"original_text": "...", "corrected_text": "..."}],
+        "citations": ["URL or reference"],
+        "confidence_score": 0-100
+    },
+    "style": {
+        "score": 0-100,
+        "consistent": true/false,
+        "recommendations": ["max 3 recommendations"],
+        "tone_consistency": "short note",
+        "formatting_consistency": "short note",
+        "voice_consistency": "short note"
+    }
+}
 """
 
-QUALITY_PROMPT_TEMPLATE = """
-Analyze the following blog content for style consistency, tone, and overall quality.
+# Per-review request; variable content last
+REVIEW_REQUEST_TEMPLATE = """
+Language: {language}
+
+Research Data:
+{research_data}
 
 Content:
 {content}
+"""
 
-Language: {language}
+# Inline form used when no context cache is available (instruction braces escaped for str.format)
+REVIEW_PROMPT_TEMPLATE = (
+    REVIEW_SYSTEM_INSTRUCTION.replace("{", "{{").replace("}", "}}")
+    + REVIEW_REQUEST_TEMPLATE
+)
 
-Return a short structured summary including:
-- score (0–100)
-- consistency (true/false)
-- recommendations (max 3)
-"""
+
+class ReviewReport(msgspec.Struct):
+    """Result of ReviewAgent.review_blog_content (fixed-layout record, C-level field access)."""
+
+    final_content: str
+    title: str
+    quality_report: Dict[str, Any]
+    fact_check_report: Dict[str, Any]
+    overall_score: float
+    status: str
+    language: str
+    meta_description: str = ""
+    applied_corrections: List[Dict[str, Any]] = []
+
+
+def _load_review_prompt() -> str:
+    """Load the combined fact-check/style review prompt template."""
+    try:
+        path = Path(__file__).parent / "prompts" / "review.txt"
+        if path.exists():
+            return path.read_text(encoding="utf-8")
+    except Exception:
+        pass
+
+    return REVIEW_PROMPT_TEMPLATE
+
+
+# Resolved once at import rather than on every ReviewAgent instantiation
+_REVIEW_PROMPT = _load_review_prompt()
 
 
 class ReviewAgent:
@@ -54,6 +165,10 @@ class ReviewAgent:
     Takes blog draft from WritingAgent and produces final polished content.
     """
 
+    # LanguageTool spawns a Java server per instance; keep one per language for the process
+    _lt_cache: Dict[str, language_tool_python.LanguageTool] = {}
+    _lt_lock = asyncio.Lock()
+
     def __init__(self):
         self.ai_clients = { 
             "gemini": gemini_client, 
@@ -67,15 +182,14 @@ class ReviewAgent:
         self.FACT_CHECK_THRESHOLD = 90.0
 
         # Load prompts
-        self.FACT_CHECK_PROMPT = self._load_fact_check_prompt() 
-        self.QUALITY_PROMPT = self._load_quality_prompt()
+        self.REVIEW_PROMPT = _REVIEW_PROMPT
 
     async def review_blog_content(
         self,
         blog_draft: Dict[str, Any],
         content_strategy: Dict[str, Any],
         task_id: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> ReviewReport:
         """
         Comprehensive review of blog content including quality checks, fact-checking,
         and media generation.
@@ -95,75 +209,157 @@ class ReviewAgent:
             target_keyword = content_strategy.get("target_keyword", "")
             language = content_strategy.get("language", "en")
 
-            # Execute all review tasks in parallel
-            tasks = [
-                self._perform_quality_checks(content, title, target_keyword, language),
-                self._perform_fact_checking(content, content_strategy, language),
-            ]
-
-            (
-                quality_results,
-                fact_check_results,
-            ) = await asyncio.gather(*tasks)
+            # The combined Gemini review feeds both the style check and the fact-check
+            llm_review = asyncio.ensure_future(
+                self._perform_llm_review(content, content_strategy, language)
+            )
+            quality_results = await self._perform_quality_checks(
+                content, title, target_keyword, language, llm_review
+            )
+            fact_check_results = (await llm_review)["fact_check"]
 
             # Apply corrections and enhancements
-            final_content = self._apply_corrections_and_enhancements(
+            final_content, applied_corrections = self._apply_corrections_and_enhancements(
                 content, fact_check_results, quality_results
             )
  
             # Compile comprehensive review report
-            return {
-                "final_content": final_content,
-                "title": title,
-                "meta_description": blog_draft.get("meta_description", ""),
-                "quality_report": quality_results,
-                "fact_check_report": fact_check_results,
-                "overall_score": self._calculate_overall_score(
+            return ReviewReport(
+                final_content=final_content,
+                title=title,
+                meta_description=blog_draft.get("meta_description", ""),
+                quality_report=quality_results,
+                fact_check_report=fact_check_results,
+                applied_corrections=applied_corrections,
+                overall_score=self._calculate_overall_score(
                     quality_results, fact_check_results
                 ),
-                "status": "review_complete",
-                "language": language,
-            }
+                status="review_complete",
+                language=language,
+            )
 
         except Exception as e:
             logger.error(f"Blog review failed: {str(e)}")
             return self._generate_fallback_review(blog_draft, content_strategy)
 
+    async def review_many(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrency: int = 20
+    ) -> List[ReviewReport]:
+        """
+        Review several drafts concurrently.
+
+        Parameters:
+        - items: list of keyword-argument dicts for `review_blog_content`
+          (blog_draft, content_strategy, task_id)
+        - max_concurrency: upper bound on reviews in flight. Each review makes
+          one Gemini call, so this trades throughput against the provider QPM
+          (GEMINI_LIMITER caps the process at 500/min regardless).
+
+        Returns:
+        - One review per item, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _review_one(item: Dict[str, Any]) -> ReviewReport:
+            async with semaphore:
+                return await self.review_blog_content(**item)
+
+        return await asyncio.gather(*(_review_one(item) for item in items))
+
     async def _check_grammar_and_typos(
         self, content: str, language: str
     ) -> Dict[str, Any]:
         """Free grammar checking using language-tool"""
         try:
-            tool = language_tool_python.LanguageTool(language)
-            matches = tool.check(content)
+            key = _content_key(content, language)
+            cached = _grammar_cache.get(key)
+            if cached is not None:
+                return cached
+
+            tool = await self._get_language_tool(language)
+            # tool.check is a blocking RPC to the Java server; long posts are split
+            # on paragraph boundaries so the server checks chunks on several threads
+            chunks = _split_for_grammar(content)
+            chunk_matches = await asyncio.gather(
+                *(asyncio.to_thread(tool.check, chunk) for _, chunk in chunks)
+            )
+            matches = []
+            for (start, _), found in zip(chunks, chunk_matches):
+                for m in found:
+                    m.offset += start
+                matches.extend(found)
 
-            return {
+            _grammar_cache[key] = result = {
                 "error_count": len(matches),
+                # Flat (original, corrected) pairs, consumed directly by the correction pass
                 "corrected_errors": [
-                    {"original": m.context, "corrected": m.replacements[0]}
-                    for m in matches
-                    if m.replacements
+                    (m.context, m.replacements[0]) for m in matches if m.replacements
                 ],
                 "passed": len(matches) < 5,  # Allow minor errors
                 "details": [str(m) for m in matches],
             }
+            return result
         except:
             return {"passed": True, "error_count": 0}  # Fail gracefully
 
+    @classmethod
+    async def _get_language_tool(cls, language: str) -> language_tool_python.LanguageTool:
+        """Return the shared LanguageTool for a language, starting it on first use."""
+        tool = cls._lt_cache.get(language)
+        if tool is not None:
+            return tool
+
+        async with cls._lt_lock:
+            tool = cls._lt_cache.get(language)
+            if tool is None:
+                tool = await asyncio.to_thread(
+                    language_tool_python.LanguageTool,
+                    language,
+                    config={
+                        "cacheSize": 1000,
+                        "pipelineCaching": True,
+                        "maxCheckThreads": _GRAMMAR_WORKERS,
+                    },
+                )
+                cls._lt_cache[language] = tool
+            return tool
+
+    @staticmethod
+    def warm_readability() -> None:
+        """Load textstat's syllable dictionaries so the first review doesn't pay for it."""
+        textstat.flesch_reading_ease("Warming up the readability dictionaries. " * 10)
+
+    @classmethod
+    def close(cls) -> None:
+        """Shut down the cached LanguageTool servers (called on app shutdown)."""
+        for tool in cls._lt_cache.values():
+            try:
+                tool.close()
+            except Exception as e:
+                logger.warning(f"LanguageTool close failed: {str(e)}")
+        cls._lt_cache.clear()
+
     async def _perform_quality_checks(
-        self, content: str, title: str, target_keyword: str, language: str
+        self,
+        content: str,
+        title: str,
+        target_keyword: str,
+        language: str,
+        llm_review: Awaitable[Dict[str, Any]],
     ) -> Dict[str, Any]:
         """Perform comprehensive quality checks on content."""
         try:
-            # Run all quality checks concurrently
+            # Run all quality checks concurrently with the Gemini review
             readability_task = self._assess_readability(content, language)
             seo_task = self._check_seo_optimization(content, title, target_keyword)
-            style_task = self._check_style_consistency(content)
             grammar_task = self._check_grammar_and_typos(content, language)
 
-            readability, seo, style, grammar = await asyncio.gather(
-                readability_task, seo_task, style_task, grammar_task
+            readability, seo, review, grammar = await asyncio.gather(
+                readability_task, seo_task, llm_review, grammar_task
             )
+            style = review["style"]
 
             return {
                 "readability": readability,
@@ -189,25 +385,18 @@ class ReviewAgent:
 
     async def _assess_readability(self, content: str, language: str) -> Dict[str, Any]:
         """Assess content readability and provide interpretation."""
+        # Flesch is meaningless on a sentence or two; skip the text scan
+        if not content or len(content) < 200:
+            return {"flesch_reading_ease": 0.0, "interpretation": "Too Short", "passed": False}
+
         try:
-            flesch = textstat.flesch_reading_ease(content)
-
-            # Interpretation inline (merged logic)
-            if flesch >= 90:
-                interpretation = "Very Easy"
-            elif flesch >= 80:
-                interpretation = "Easy"
-            elif flesch >= 70:
-                interpretation = "Fairly Easy"
-            elif flesch >= 60:
-                interpretation = "Standard"
-            elif flesch >= 50:
-                interpretation = "Fairly Difficult"
-            elif flesch >= 30:
-                interpretation = "Difficult"
-            else:
-                interpretation = "Very Difficult"
+            key = _content_key(content, language)
+            flesch = _readability_cache.get(key)
+            if flesch is None:
+                flesch = await asyncio.to_thread(textstat.flesch_reading_ease, content)
+                _readability_cache[key] = flesch
 
+            interpretation = _FLESCH_LABELS[bisect.bisect_right(_FLESCH_CUTS, flesch)]
             return {
                 "flesch_reading_ease": flesch,
                 "interpretation": interpretation,
@@ -222,14 +411,14 @@ class ReviewAgent:
         self, content: str, title: str, target_keyword: str
     ) -> Dict[str, Any]:
         """Check SEO optimization."""
-        try:
-            content = content or ""
-            title = title or ""
-            target_keyword = target_keyword or ""
+        if not target_keyword or not content:
+            return {"overall_seo_score": 60, "keyword_usage": "n/a", "passed": False}
 
-            # Count keyword occurrences
-            keyword_count = content.lower().count(target_keyword.lower())
-            title_contains = target_keyword.lower() in title.lower()
+        try:
+            # Case-insensitive matching without lowercasing copies of the content
+            keyword_re = _keyword_re(target_keyword)
+            keyword_count = len(keyword_re.findall(content))
+            title_contains = keyword_re.search(title or "") is not None
 
             # Basic SEO scoring
             score = 60  # Base score
@@ -249,76 +438,127 @@ class ReviewAgent:
             logger.error(f"SEO check failed: {str(e)}")
             return {"passed": False, "error": str(e)}
 
-    async def _perform_fact_checking(
+    async def _perform_llm_review(
         self, content: str, content_strategy: Dict[str, Any], language: str
     ) -> Dict[str, Any]:
-        """Perform fact-checking on content."""
+        """Fact-check and style-review the content with a single Gemini call."""
         try:
             research_data = content_strategy.get("research_data", {})
             verified_facts = content_strategy.get("verified_facts", [])
 
-            prompt = self.FACT_CHECK_PROMPT.format(
-                content=content[:4000],
-                research_data=json.dumps(
-                    {**research_data, "verified_facts": verified_facts},
-                    ensure_ascii=False,
-                ),
+            research_json = orjson.dumps(
+                {**research_data, "verified_facts": verified_facts},
+                option=orjson.OPT_NON_STR_KEYS,
+            ).decode()
+            content = content[:4000]
+
+            key = _content_key(f"{research_json}|{content}", language)
+            cached = _llm_review_cache.get(key)
+            if cached is not None:
+                return cached
+
+            # A custom prompts/review.txt is always sent inline
+            cached_content = None
+            if self.REVIEW_PROMPT is REVIEW_PROMPT_TEMPLATE:
+                cached_content = await gemini_client.get_cached_content(
+                    "review.v1", REVIEW_SYSTEM_INSTRUCTION
+                )
+            template = REVIEW_REQUEST_TEMPLATE if cached_content else self.REVIEW_PROMPT
+            prompt = template.format(
+                content=content,
+                research_data=research_json,
                 language=language,
             )
 
             response = await gemini_client.generate_structured(
-                prompt=prompt, 
+                prompt=prompt, cached_content=cached_content
             )
+            if not isinstance(response, dict):
+                response = {}
 
-            result = self._parse_fact_check_response(response)
+            result = self._parse_fact_check_response(response.get("fact_check") or {})
             confidence = float(result.get("confidence_score", 0))
 
-            return {
-                **result,
-                "confidence_score": confidence,
-                "passed": confidence >= self.FACT_CHECK_THRESHOLD,
+            review = {
+                "fact_check": {
+                    **result,
+                    "confidence_score": confidence,
+                    "passed": confidence >= self.FACT_CHECK_THRESHOLD,
+                },
+                "style": self._parse_style_response(response.get("style") or {}),
             }
+            # Empty responses are usually transient parse failures; don't pin them
+            if response:
+                _llm_review_cache[key] = review
+            return review
 
         except Exception as e:
-            logger.error(f"Fact-checking failed: {str(e)}")
-            return {"passed": False, "corrections": [], "citations": []}
+            logger.error(f"Gemini review failed: {str(e)}")
+            return {
+                "fact_check": {"passed": False, "corrections": [], "citations": []},
+                "style": self._generate_fallback_style_report(str(e)),
+            }
 
     def _apply_corrections_and_enhancements(
         self,
         content: str,
         fact_check_results: Dict[str, Any],
         quality_results: Dict[str, Any],
-    ) -> str:
-        """Apply all corrections and enhancements to content."""
+    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Apply all corrections and enhancements to content.
+        Returns the corrected content and the edits made (offsets into the original).
+        """
         try:
-            # Apply fact-check corrections
-            corrected_content = content
-            if fact_check_results.get("corrections"):
-                for correction in fact_check_results["corrections"]:
-                    original = correction.get("original_text", "")
-                    corrected = correction.get("corrected_text", "")
-                    if original and corrected:
-                        corrected_content = corrected_content.replace(
-                            original, corrected
-                        )
-
-            # Apply grammar corrections
-            if quality_results.get("grammar", {}).get("corrected_errors"):
-                for error in quality_results["grammar"]["corrected_errors"]:
-                    if (
-                        isinstance(error, dict)
-                        and "original" in error
-                        and "corrected" in error
-                    ):
-                        corrected_content = corrected_content.replace(
-                            error["original"], error["corrected"]
-                        )
-
-            return corrected_content
+            replacements: Dict[str, str] = {}
+
+            # Grammar corrections
+            for original, corrected in quality_results.get("grammar", {}).get("corrected_errors") or []:
+                replacements[original] = corrected
+
+            # Fact-check corrections take precedence over grammar fixes
+            for correction in fact_check_results.get("corrections") or []:
+                original = correction.get("original_text", "")
+                corrected = correction.get("corrected_text", "")
+                if original and corrected:
+                    replacements[original] = corrected
+
+            replacements.pop("", None)
+            if not replacements:
+                return content, []
+
+            # One scan over the content; longest originals first so prefixes don't shadow them
+            pattern = re.compile(
+                "|".join(map(re.escape, sorted(replacements, key=len, reverse=True)))
+            )
+
+            # Copy unchanged spans once and splice replacements in, recording each edit
+            parts: List[str] = []
+            edits: List[Dict[str, Any]] = []
+            cursor = 0
+            for m in pattern.finditer(content):
+                original = m.group(0)
+                corrected = replacements[original]
+                parts.append(content[cursor:m.start()])
+                parts.append(corrected)
+                edits.append(
+                    {
+                        "start": m.start(),
+                        "end": m.end(),
+                        "original": original,
+                        "corrected": corrected,
+                    }
+                )
+                cursor = m.end()
+
+            if not edits:
+                return content, []
+            parts.append(content[cursor:])
+            return "".join(parts), edits
 
         except Exception as e:
             logger.error(f"Content correction failed: {str(e)}")
-            return content
+            return content, []
 
     def _calculate_overall_score(
         self, quality_results: Dict[str, Any], fact_check_results: Dict[str, Any]
@@ -337,98 +577,72 @@ class ReviewAgent:
         grammar: Dict[str, Any],
     ) -> float:
         """Calculate overall quality score from components."""
-        scores = [
-            readability.get("flesch_reading_ease", 60),
-            seo.get("overall_seo_score", 70),
-            style.get("overall_consistency_score", 75),
-            100
-            - min(grammar.get("error_count", 0) * 5, 100),  # Convert errors to score
-        ]
-
-        return round(sum(scores) / len(scores), 1)
+        scores = np.array(
+            [
+                readability.get("flesch_reading_ease", 60),
+                seo.get("overall_seo_score", 70),
+                style.get("overall_consistency_score", 75),
+                100
+                - min(grammar.get("error_count", 0) * 5, 100),  # Convert errors to score
+            ],
+            dtype=np.float64,
+        )
+
+        return round(float(scores @ _QUALITY_SCORE_WEIGHTS), 1)
  
 
     def _parse_fact_check_response(self, response: Any) -> Dict[str, Any]:
         """Parse fact-check response."""
         try:
             if isinstance(response, str):
-                result = json.loads(response)
+                result = orjson.loads(response)
             else:
                 result = response
 
             # Ensure required fields
-            required = ["corrections", "citations", "confidence_score"]
-            for field in required:
-                if field not in result:
-                    result[field] = [] if field in ["corrections", "citations"] else 0
+            for field in _FACT_CHECK_FIELDS:
+                result.setdefault(field, [] if field in _FACT_CHECK_LIST_FIELDS else 0)
 
             return result
 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             return {"corrections": [], "citations": [], "confidence_score": 0}
  
-    def _load_fact_check_prompt(self) -> str:
-        """Load fact-check prompt template."""
-        try:
-            path = Path(__file__).parent / "prompts" / "fact_checking.txt"
-            if path.exists():
-                return path.read_text(encoding="utf-8")
-        except Exception:
-            pass
-
-        return FACT_CHECK_PROMPT_TEMPLATE
-
-    async def _check_style_consistency(self, content: str) -> Dict[str, Any]:
-        """Check style consistency using structured AI analysis."""
-        try:
-            prompt = self.QUALITY_PROMPT.format(content=content[:3000], language="English")
-            response = await gemini_client.generate_structured(prompt=prompt)
-
-            # Use structured response directly
-            return {
-                "passed": response.get("consistent", True),
-                "overall_consistency_score": response.get("score", 85),
-                "recommendations": response.get("recommendations", []),
-                "details": {
-                    "tone_consistency": response.get("tone_consistency", "stable"),
-                    "formatting_consistency": response.get("formatting_consistency", "good"),
-                    "voice_consistency": response.get("voice_consistency", "consistent"),
-                },
-            }
-
-        except Exception as e:
-            logger.warning(f"Style consistency check failed: {str(e)}")
-            return {
-                "passed": True,
-                "overall_consistency_score": 85,
-                "recommendations": ["Style check temporarily unavailable"],
-                "details": {"error": str(e)},
-            }
- 
-
-
+    def _parse_style_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
+        """Map the style part of the review response onto the style report."""
+        return {
+            "passed": response.get("consistent", True),
+            "overall_consistency_score": response.get("score", 85),
+            "recommendations": response.get("recommendations", []),
+            "details": {
+                "tone_consistency": response.get("tone_consistency", "stable"),
+                "formatting_consistency": response.get("formatting_consistency", "good"),
+                "voice_consistency": response.get("voice_consistency", "consistent"),
+            },
+        }
 
-    def _load_quality_prompt(self) -> str:
-        """Load quality assessment prompt template."""
-        # Basic quality prompt template
-        return """
-        Analyze the quality of the provided content and provide comprehensive assessment.
-        Include readability, SEO, style consistency, and grammar analysis.
-        """
+    def _generate_fallback_style_report(self, error: str) -> Dict[str, Any]:
+        """Neutral style report used when the Gemini review is unavailable."""
+        return {
+            "passed": True,
+            "overall_consistency_score": 85,
+            "recommendations": ["Style check temporarily unavailable"],
+            "details": {"error": error},
+        }
 
     def _generate_fallback_review(
         self, blog_draft: Dict[str, Any], content_strategy: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> ReviewReport:
         """Generate fallback review when main process fails."""
-        return {
-            "final_content": blog_draft.get("content", ""),
-            "title": blog_draft.get("title", ""),
-            "quality_report": self._generate_fallback_quality_report(),
-            "fact_check_report": {"passed": False, "corrections": [], "citations": []},
-            "overall_score": 60,
-            "status": "fallback_review",
-            "language": content_strategy.get("language", "en"),
-        }
+        return ReviewReport(
+            final_content=blog_draft.get("content", ""),
+            title=blog_draft.get("title", ""),
+            quality_report=self._generate_fallback_quality_report(),
+            fact_check_report={"passed": False, "corrections": [], "citations": []},
+            overall_score=60,
+            status="fallback_review",
+            language=content_strategy.get("language", "en"),
+        )
 
     def _generate_fallback_quality_report(self) -> Dict[str, Any]:
         """Generate fallback quality report."""
@@ -1,15 +1,202 @@
 import logging
-import json
+import asyncio
+import functools
+import re
+from types import MappingProxyType
+import orjson
 from uuid import UUID
 from typing import Dict, List, Any, Optional 
 
+import msgspec
+from cachetools import LRUCache
+
 from ..clients.ai_clients import gemini_client 
+from ..core.llm_cache import LLMCache
 from ..core.security import validate_language
 from ..tools.google_search_tool import google_search_tool
 
 
 logger = logging.getLogger(__name__)
 
+# Identical research/outline prompts (same topic and keyword) skip Gemini for an hour;
+# research for a near-identical topic/keyword pair is matched by embedding
+_strategy_llm_cache = LLMCache(maxsize=512, ttl=3600, semantic_threshold=0.92)
+
+
+def _research_namespace(language: str, target_keyword: str) -> str:
+    """Semantic matches stay within one language and one (normalized) target keyword;
+    a near-miss keyword must not get another keyword's research."""
+    return f"{language}|{' '.join(target_keyword.lower().split())}"
+
+
+# The research calls all embed the same topic/keyword text, concurrently; the cache
+# holds the embedding task so they share one in-flight request
+_embedding_cache: LRUCache = LRUCache(maxsize=256)
+
+
+# Each prompt is a static system instruction (role, JSON schema, rules), served from a
+# Gemini context cache when possible, plus a short per-request block with the variables.
+RESEARCH_COMPETITORS_SYSTEM_INSTRUCTION = """
+As a professional SEO researcher, analyze the topic and target keyword you are given,
+writing in the requested language.
+
+List the top 5 competitors with their strengths and weaknesses.
+
+Respond as JSON: {"competitors":[{"name":str,"url":str,"strengths":[str],"weaknesses":[str]}]}
+"""
+
+# Short classification-style tasks, served by the lite model tier
+RESEARCH_KEYWORDS_SYSTEM_INSTRUCTION = """
+As a professional SEO researcher, analyze the topic and target keyword you are given,
+writing in the requested language.
+
+List the common questions people ask about this topic, and semantic keywords and related terms.
+
+Respond as JSON: {"common_questions":[str],"semantic_keywords":[str]}
+"""
+
+RESEARCH_ENRICH_SYSTEM_INSTRUCTION = """
+As a professional SEO researcher, analyze the topic and target keyword you are given,
+writing in the requested language.
+
+Identify content gaps and opportunities, and classify the search intent.
+
+Respond as JSON: {"content_gaps":[str],"search_intent":"informational"|"commercial"|"transactional"}
+"""
+
+RESEARCH_REQUEST_TEMPLATE = """
+Topic: "{topic}"
+Target keyword: "{target_keyword}"
+Language: {language}
+"""
+
+OUTLINE_SYSTEM_INSTRUCTION = """
+Create a comprehensive article outline for the target keyword you are given,
+using the research data provided with it.
+
+Important: The article outline should contain **exactly 7 sections** (H2 headings). 
+Distribute the content logically to cover all important subtopics.
+
+Structure required:
+1. Title
+2. SEO meta description
+3. Word count target
+4. Detailed structure with H2/H3 headings, keywords, and estimated length
+
+Format as JSON:
+{
+"title": "Article Title",
+"meta_description": "SEO meta description",
+"word_count_target": 3000,
+"structure": [
+    {
+    "heading": "H2 Heading",
+    "subheadings": ["H3 Subheading 1", "H3 Subheading 2"],
+    "keywords": ["keyword1", "keyword2"],
+    "estimated_length": 500
+    }
+]
+}
+"""
+
+OUTLINE_REQUEST_TEMPLATE = """
+Target keyword: "{target_keyword}"
+Language: {language}
+Search intent: {search_intent}
+
+Competitor analysis: {competitors}
+Common questions: {common_questions}
+Semantic keywords: {semantic_keywords}
+"""
+
+
+# Rule-based search intent, checked in priority order; anything else (including
+# "what is" / "how to" / "guide" queries) is informational
+_INTENT_PATTERNS = (
+    (re.compile(r"\b(?:buy|purchase|order)\b", re.IGNORECASE), "transactional"),
+    (re.compile(r"\b(?:best|top|reviews)\b", re.IGNORECASE), "commercial"),
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify_search_intent(keyword: str) -> str:
+    for pattern, intent in _INTENT_PATTERNS:
+        if pattern.search(keyword):
+            return intent
+    return "informational"
+
+
+# intent_analysis confidence/method, by where the search intent came from
+_AI_INTENT = MappingProxyType({"confidence": 0.8, "method": "ai_research"})
+_RULE_INTENT = MappingProxyType({"confidence": 0.5, "method": "rule_based"})
+
+
+# Fallback skeletons, kept immutable; only the topic/keyword is filled in per call
+_FALLBACK_COMPETITORS = (
+    ("Wikipedia", "wikipedia.org", ("Comprehensive", "Authoritative"), ("Not specialized", "Generic content")),
+    ("Industry Blog", "example.com/blog", ("Specialized", "Current"), ("Biased", "Limited scope")),
+)
+_FALLBACK_QUESTIONS = (
+    "What is {topic}?",
+    "How does {topic} work?",
+    "What are the benefits of {topic}?",
+    "How to get started with {topic}?",
+)
+_FALLBACK_KEYWORDS = ("{kw}", "best {kw}", "{kw} guide", "how to use {kw}")
+_FALLBACK_CONTENT_GAPS = (
+    "Practical examples",
+    "Step-by-step tutorials",
+    "Case studies",
+    "Video content",
+)
+
+# (heading, subheadings, keywords, estimated_length) for the 7-section fallback outline
+_FALLBACK_OUTLINE_SECTIONS = (
+    ("What is {kw}?", ("Definition", "Key Concepts", "Importance"), ("{kw}", "what is {kw}"), 400),
+    ("History / Background", ("Origin", "Evolution", "Milestones"), ("{kw} history", "{kw} evolution"), 350),
+    ("Benefits of {kw}", ("Advantage 1", "Advantage 2", "Real-world Applications"), ("benefits of {kw}", "{kw} advantages"), 400),
+    ("Implementation / How to Get Started", ("Step-by-Step Guide", "Best Practices", "Common Mistakes to Avoid"), ("how to use {kw}", "{kw} tutorial"), 450),
+    ("Case Studies / Examples", ("Example 1", "Example 2", "Lessons Learned"), ("{kw} examples", "{kw} case studies"), 400),
+    ("Advanced Tips / Strategies", ("Tip 1", "Tip 2", "Pro Advice"), ("{kw} advanced", "{kw} strategies"), 400),
+    ("Conclusion", ("Summary", "Next Steps", "Additional Resources"), ("{kw} summary", "{kw} conclusion"), 300),
+)
+
+
+# Reply schemas: Gemini JSON is decoded straight into these (missing keys get defaults)
+class Competitor(msgspec.Struct):
+    name: str = ""
+    url: str = ""
+    strengths: List[str] = []
+    weaknesses: List[str] = []
+
+
+class CompetitorReport(msgspec.Struct):
+    competitors: List[Competitor]
+
+
+class KeywordReport(msgspec.Struct):
+    common_questions: List[str] = []
+    semantic_keywords: List[str] = []
+
+
+class ResearchEnrichment(msgspec.Struct):
+    content_gaps: List[str] = []
+    search_intent: Optional[str] = None
+
+
+class OutlineSection(msgspec.Struct):
+    heading: str
+    subheadings: List[str] = []
+    keywords: List[str] = []
+    estimated_length: int = 0
+
+
+class Outline(msgspec.Struct):
+    title: str
+    structure: List[OutlineSection]
+    meta_description: str = ""
+    word_count_target: int = 3000
+
 
 class StrategyAgent:
     """
@@ -32,46 +219,81 @@ class StrategyAgent:
         task_id: UUID,   # convert str → UUID if needed
         url_id: UUID,    # convert str → UUID if needed
         competitors: Optional[List[str]] = None,
-        language: str = "en"
+        language: str = "en",
+        enrich_with_search: bool = False,
+        slim: bool = False,
     ) -> Dict[str, Any]:
         """
-        Generate comprehensive content strategy with minimal AI calls:
-        - Call #1: _research_topic
-        - Call #2: _generate_outline
+        Generate comprehensive content strategy in two concurrent stages:
+        - Stage 1: _research_core (competitors + keywords calls) (+ search enrichment)
+        - Stage 2: _generate_outline alongside _research_enrich
         Optimized for Writing Agent consumption.
+        `enrich_with_search` adds SerpAPI competitors and snippets to the research.
+        `slim` omits the raw `research_data` dict, whose fields are already projected
+        to the top level; the writing and review agents still read it, so the
+        pipeline keeps the default.
         """
         try:
             # Validate language
             if not validate_language(language):
-                logger.warning(f"Unsupported language '{language}', defaulting to 'en'")
+                logger.warning("Unsupported language '%s', defaulting to 'en'", language)
                 language = "en"
 
-            # --- AI Call #1: Research everything in one go ---
-            try:
-                research_data = await self._research_topic(
+            # --- Stage 1: core research (needed by the outline) + optional search enrichment ---
+            stage_one = [
+                self._research_core(
                     topic=topic,
                     target_keyword=target_keyword,
                     language=language,
                 )
-            except Exception as e:
-                logger.error(f"Research topic failed: {str(e)}")
-                research_data = self._generate_fallback_research(topic, target_keyword)
-
-            enrich_with_search: bool = False,
-
-             # Optional: Enrich competitors and gaps using search tool
-            if enrich_with_search and self.search_tool:
-                try:
-                    search_competitors = await self.search_tool.find_competitors(target_keyword)
-                    if search_competitors:
-                        research_data["competitors"].extend(search_competitors)
-                    
-                    snippets = await self.search_tool.extract_snippets(target_keyword, num_results=5)
-                    if snippets:
-                        research_data["content_gaps"].extend(snippets)
-                except Exception as e:
-                    logger.warning(f"Search enrichment failed: {str(e)}")
-
+            ]
+            search_tool = self.search_tool
+            if enrich_with_search and search_tool:
+                stage_one += [
+                    search_tool.find_competitors(target_keyword),
+                    search_tool.extract_snippets(target_keyword, num_results=5),
+                ]
+            core, *search_results = await asyncio.gather(*stage_one, return_exceptions=True)
+
+            if isinstance(core, Exception):
+                logger.error("Research topic failed: %s", core)
+                core = self._generate_fallback_research(topic, target_keyword)
+            research_data = core
+
+            # --- Stage 2: outline and the remaining research run side by side ---
+            outline_result, enrich = await asyncio.gather(
+                self._generate_outline(
+                    research_data,
+                    target_keyword,
+                    language,
+                    website_info=None,
+                ),
+                self._research_enrich(
+                    topic=topic,
+                    target_keyword=target_keyword,
+                    language=language,
+                ),
+                return_exceptions=True,
+            )
+
+            if isinstance(enrich, Exception):
+                logger.warning("Research enrichment failed: %s", enrich)
+                enrich = {}
+            research_data.setdefault("content_gaps", [])
+            for key, value in enrich.items():
+                if value:
+                    research_data[key] = value
+
+            # Optional: Enrich competitors and gaps using search tool
+            for result in search_results:
+                if isinstance(result, Exception):
+                    logger.warning("Search enrichment failed: %s", result)
+            if search_results:
+                search_competitors, snippets = search_results
+                if search_competitors and isinstance(search_competitors, list):
+                    research_data.setdefault("competitors", []).extend(search_competitors)
+                if snippets and isinstance(snippets, list):
+                    research_data["content_gaps"].extend(snippets)
 
             # Extract structured fields from research_data
             competitor_analysis = {"competitors": research_data.get("competitors", [])}
@@ -79,28 +301,17 @@ class StrategyAgent:
             content_gaps = research_data.get("content_gaps", [])
             common_questions = research_data.get("common_questions", [])
             search_intent = research_data.get("search_intent")
+            intent_source = _AI_INTENT if search_intent else _RULE_INTENT
             if not search_intent:
                 search_intent = self.detect_search_intent(target_keyword)
 
-            
             # Create intent_analysis from search_intent
-            intent_analysis = {
-                "intent": search_intent,
-                "confidence": 0.8 if research_data.get("search_intent") else 0.5,
-                "method": "ai_research" if research_data.get("search_intent") else "rule_based"
-                }
+            intent_analysis = {"intent": search_intent, **intent_source}
 
-            # --- AI Call #2: Outline generation ---
-            try:
-                outline = await self._generate_outline(
-                    research_data,
-                    target_keyword,
-                    language,
-                    website_info=None,
-                )
-            except Exception as e:
-                logger.warning(f"Outline generation failed: {str(e)}")
-                outline = self._generate_fallback_outline(target_keyword, language)
+            if isinstance(outline_result, Exception):
+                logger.warning("Outline generation failed: %s", outline_result)
+                outline_result = self._generate_fallback_outline(target_keyword, language)
+            outline = outline_result
 
             # Compile final strategy
             content_strategy = {
@@ -114,64 +325,96 @@ class StrategyAgent:
                 "seo_analysis": {},  # can be filled later if needed
                 "research_data": research_data,
                 "outline": outline,
-                "competitors":topic.get("competitors", []),
+                "competitors": research_data.get("competitors", []),
                 "semantic_keywords": keyword_research[:15],
                 "content_gaps": content_gaps,
                 "common_questions": common_questions,
                 "verified_facts": [],  # populated later during writing
             }
 
-            return content_strategy
-
         except Exception as e:
-            logger.error(f"Content strategy generation failed: {str(e)}")
-            return self._generate_fallback_strategy(topic, target_keyword, language)
+            logger.error("Content strategy generation failed: %s", e)
+            content_strategy = self._generate_fallback_strategy(topic, target_keyword, language)
+
+        if slim:
+            content_strategy.pop("research_data", None)
+        return content_strategy
 
-    async def _research_topic(
+    async def _research_core(
         self, topic: str, target_keyword: str, language: str
     ) -> Dict[str, Any]:
-        """Research the topic and generate comprehensive data."""
+        """
+        Research what the outline depends on: competitors (default model) alongside
+        common questions and semantic keywords (lite model).
+        """
         try:
-            prompt = f"""
-            As a professional SEO researcher, analyze the topic "{topic}" with target keyword "{target_keyword}".
-            Language: {language}
-
-            Provide a comprehensive research report including:
-
-            1. Top 5 competitor analysis with their strengths and weaknesses
-            2. Common questions people ask about this topic
-            3. Semantic keywords and related terms
-            4. Content gaps and opportunities
-            5. Search intent analysis
-
-            Format your response as JSON:
-            {{
-              "competitors": [
-                {{
-                  "name": "Competitor Name",
-                  "url": "competitor-url.com",
-                  "strengths": ["strength1", "strength2"],
-                  "weaknesses": ["weakness1", "weakness2"]
-                }}
-              ],
-              "common_questions": ["question1", "question2"],
-              "semantic_keywords": ["keyword1", "keyword2"],
-              "content_gaps": ["gap1", "gap2"],
-              "search_intent": "informational/commercial/transactional"
-            }}
-            """
-
-            response = await gemini_client.generate_structured(prompt=prompt)
-
-            if not response:
+            request = RESEARCH_REQUEST_TEMPLATE.format(
+                topic=topic, target_keyword=target_keyword, language=language
+            )
+            semantic_text = f"{topic}\n{target_keyword}"
+            namespace = _research_namespace(language, target_keyword)
+            competitors, keywords = await asyncio.gather(
+                self._generate_structured(
+                    "strategy.competitors.v1",
+                    RESEARCH_COMPETITORS_SYSTEM_INSTRUCTION,
+                    request,
+                    CompetitorReport,
+                    semantic_text=semantic_text,
+                    namespace=namespace,
+                ),
+                self._generate_structured(
+                    "strategy.keywords.v1",
+                    RESEARCH_KEYWORDS_SYSTEM_INSTRUCTION,
+                    request,
+                    KeywordReport,
+                    semantic_text=semantic_text,
+                    namespace=namespace,
+                    model=gemini_client.lite_model,
+                ),
+                return_exceptions=True,
+            )
+            for result in (competitors, keywords):
+                if isinstance(result, Exception):
+                    logger.error("Topic research call failed: %s", result)
+
+            competitors = competitors if isinstance(competitors, dict) else {}
+            keywords = keywords if isinstance(keywords, dict) else {}
+            if not competitors and not keywords:
                 return self._generate_fallback_research(topic, target_keyword)
- 
-            return response
+
+            research = {**competitors, **keywords}
+            if not competitors or not keywords:
+                fallback = self._generate_fallback_research(topic, target_keyword)
+                for field in ("competitors", "common_questions", "semantic_keywords"):
+                    research.setdefault(field, fallback[field])
+            return research
 
         except Exception as e:
-            logger.error(f"Topic research failed: {str(e)}")
+            logger.error("Topic research failed: %s", e)
             return self._generate_fallback_research(topic, target_keyword)
 
+    async def _research_enrich(
+        self, topic: str, target_keyword: str, language: str
+    ) -> Dict[str, Any]:
+        """Research the parts the outline doesn't need: content gaps and search intent."""
+        response = await self._generate_structured(
+            "strategy.research_enrich.v1",
+            RESEARCH_ENRICH_SYSTEM_INSTRUCTION,
+            RESEARCH_REQUEST_TEMPLATE.format(
+                topic=topic, target_keyword=target_keyword, language=language
+            ),
+            ResearchEnrichment,
+            semantic_text=f"{topic}\n{target_keyword}",
+            namespace=_research_namespace(language, target_keyword),
+            model=gemini_client.lite_model,
+        )
+        if not isinstance(response, dict):
+            return {}
+        return {
+            "content_gaps": response.get("content_gaps", []),
+            "search_intent": response.get("search_intent"),
+        }
+
     async def _generate_outline(
         self,
         research_data: Dict,
@@ -179,44 +422,25 @@ class StrategyAgent:
         language: str,
         website_info: Optional[Dict] = None,
     ) -> Dict:
-        """Generate article outline based on research data."""
+        """
+        Generate article outline based on research data.
+        """
         try:
-            prompt = f"""
-            Create a comprehensive article outline for target keyword "{target_keyword}".
-
-            Competitor analysis: {json.dumps(research_data.get("competitors", []))}
-            Common questions: {json.dumps(research_data.get("common_questions", []))}
-            Semantic keywords: {json.dumps(research_data.get("semantic_keywords", []))}
-            Search intent: {research_data.get("search_intent", "informational")}
-            Language: {language}
-
-            Important: The article outline should contain **exactly 7 sections** (H2 headings). 
-            Distribute the content logically to cover all important subtopics.
-
-            Structure required:
-            1. Title
-            2. SEO meta description
-            3. Word count target
-            4. Detailed structure with H2/H3 headings, keywords, and estimated length
-
-            Format as JSON:
-            {{
-            "title": "Article Title",
-            "meta_description": "SEO meta description",
-            "word_count_target": 3000,
-            "structure": [
-                {{
-                "heading": "H2 Heading",
-                "subheadings": ["H3 Subheading 1", "H3 Subheading 2"],
-                "keywords": ["keyword1", "keyword2"],
-                "estimated_length": 500
-                }}
-            ]
-            }}
-            """
-
-
-            outline_data = await gemini_client.generate_structured(prompt=prompt)
+            prompt = OUTLINE_REQUEST_TEMPLATE.format(
+                target_keyword=target_keyword,
+                language=language,
+                search_intent=research_data.get("search_intent") or self.detect_search_intent(target_keyword),
+                competitors=orjson.dumps(research_data.get("competitors", [])).decode(),
+                common_questions=orjson.dumps(research_data.get("common_questions", [])).decode(),
+                semantic_keywords=orjson.dumps(research_data.get("semantic_keywords", [])).decode(),
+            )
+
+            outline_data = await self._generate_structured(
+                "strategy.outline.v1",
+                OUTLINE_SYSTEM_INSTRUCTION,
+                prompt,
+                Outline,
+            )
 
             if not outline_data:
                 return self._generate_fallback_outline(target_keyword, language)
@@ -226,9 +450,82 @@ class StrategyAgent:
             return outline_dict
 
         except Exception as e:
-            logger.error(f"Outline generation failed: {str(e)}")
+            logger.error("Outline generation failed: %s", e)
             return self._generate_fallback_outline(target_keyword, language)
 
+    async def _generate_structured(
+        self,
+        cache_key: str,
+        system_instruction: str,
+        request: str,
+        response_type: Optional[type] = None,
+        semantic_text: Optional[str] = None,
+        namespace: str = "",
+        model: Optional[str] = None,
+    ) -> Any:
+        """
+        Structured Gemini call for a static instruction plus a per-request block.
+
+        Repeats are answered from the local LLM cache: exact prompt matches
+        first, then (given `semantic_text`) near-duplicates by embedding.
+        Otherwise the instruction is referenced through a Gemini context cache,
+        or sent inline ahead of the request when caching is unavailable.
+        `model` selects a tier (e.g. gemini_client.lite_model); defaults to the client's.
+        """
+        model = model or gemini_client.model
+        cached = _strategy_llm_cache.get(model, system_instruction, request)
+        if cached is not None:
+            return cached
+
+        # The embedding only gates generation when the namespace has entries to
+        # match; otherwise it runs alongside the call, just to index the reply
+        embed_task = None
+        if semantic_text and _strategy_llm_cache.semantic_enabled:
+            embed_task = asyncio.ensure_future(self._embed(semantic_text))
+            if _strategy_llm_cache.has_similar(model, system_instruction, namespace):
+                embedding = await embed_task
+                if embedding is not None:
+                    cached = _strategy_llm_cache.get_similar(
+                        model, system_instruction, embedding, namespace
+                    )
+                    if cached is not None:
+                        logger.info("Strategy semantic cache hit (%s)", cache_key)
+                        return cached
+
+        cached_content = await gemini_client.get_cached_content(
+            cache_key, system_instruction, model=model
+        )
+        prompt = request if cached_content else system_instruction + request
+        response = await gemini_client.generate_structured(
+            prompt=prompt,
+            cached_content=cached_content,
+            response_type=response_type,
+            model=model,
+        )
+
+        # Empty responses are usually transient parse failures; don't pin them
+        if response:
+            embedding = await embed_task if embed_task else None
+            _strategy_llm_cache.set(
+                model, system_instruction, request, response, embedding, namespace
+            )
+        return response
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Embedding for semantic cache lookups (None on failure); memoized per text."""
+        task = _embedding_cache.get(text)
+        if task is None:
+            task = asyncio.ensure_future(gemini_client.embed(text))
+            _embedding_cache[text] = task
+        try:
+            # Shielded: one caller's cancellation must not cancel the shared request
+            return await asyncio.shield(task)
+        except Exception as e:
+            if _embedding_cache.get(text) is task:
+                del _embedding_cache[text]
+            logger.debug("Strategy embedding failed, skipping semantic cache: %s", e)
+            return None
+
     def _generate_fallback_research(
         self, topic: str, target_keyword: str
     ) -> Dict[str, Any]:
@@ -236,36 +533,16 @@ class StrategyAgent:
         return {
             "competitors": [
                 {
-                    "name": "Wikipedia",
-                    "url": "wikipedia.org",
-                    "strengths": ["Comprehensive", "Authoritative"],
-                    "weaknesses": ["Not specialized", "Generic content"],
-                },
-                {
-                    "name": "Industry Blog",
-                    "url": "example.com/blog",
-                    "strengths": ["Specialized", "Current"],
-                    "weaknesses": ["Biased", "Limited scope"],
-                },
-            ],
-            "common_questions": [
-                f"What is {topic}?",
-                f"How does {topic} work?",
-                f"What are the benefits of {topic}?",
-                f"How to get started with {topic}?",
-            ],
-            "semantic_keywords": [
-                target_keyword,
-                f"best {target_keyword}",
-                f"{target_keyword} guide",
-                f"how to use {target_keyword}",
-            ],
-            "content_gaps": [
-                "Practical examples",
-                "Step-by-step tutorials",
-                "Case studies",
-                "Video content",
+                    "name": name,
+                    "url": url,
+                    "strengths": list(strengths),
+                    "weaknesses": list(weaknesses),
+                }
+                for name, url, strengths, weaknesses in _FALLBACK_COMPETITORS
             ],
+            "common_questions": [q.format(topic=topic) for q in _FALLBACK_QUESTIONS],
+            "semantic_keywords": [k.format(kw=target_keyword) for k in _FALLBACK_KEYWORDS],
+            "content_gaps": list(_FALLBACK_CONTENT_GAPS),
             "search_intent": "informational",
         }
 
@@ -277,47 +554,12 @@ class StrategyAgent:
             "word_count_target": 3000,
             "structure": [
                 {
-                    "heading": f"What is {target_keyword}?",
-                    "subheadings": ["Definition", "Key Concepts", "Importance"],
-                    "keywords": [target_keyword, f"what is {target_keyword}"],
-                    "estimated_length": 400,
-                },
-                {
-                    "heading": f"History / Background",
-                    "subheadings": ["Origin", "Evolution", "Milestones"],
-                    "keywords": [f"{target_keyword} history", f"{target_keyword} evolution"],
-                    "estimated_length": 350,
-                },
-                {
-                    "heading": f"Benefits of {target_keyword}",
-                    "subheadings": ["Advantage 1", "Advantage 2", "Real-world Applications"],
-                    "keywords": [f"benefits of {target_keyword}", f"{target_keyword} advantages"],
-                    "estimated_length": 400,
-                },
-                {
-                    "heading": "Implementation / How to Get Started",
-                    "subheadings": ["Step-by-Step Guide", "Best Practices", "Common Mistakes to Avoid"],
-                    "keywords": [f"how to use {target_keyword}", f"{target_keyword} tutorial"],
-                    "estimated_length": 450,
-                },
-                {
-                    "heading": "Case Studies / Examples",
-                    "subheadings": ["Example 1", "Example 2", "Lessons Learned"],
-                    "keywords": [f"{target_keyword} examples", f"{target_keyword} case studies"],
-                    "estimated_length": 400,
-                },
-                {
-                    "heading": "Advanced Tips / Strategies",
-                    "subheadings": ["Tip 1", "Tip 2", "Pro Advice"],
-                    "keywords": [f"{target_keyword} advanced", f"{target_keyword} strategies"],
-                    "estimated_length": 400,
-                },
-                {
-                    "heading": "Conclusion",
-                    "subheadings": ["Summary", "Next Steps", "Additional Resources"],
-                    "keywords": [f"{target_keyword} summary", f"{target_keyword} conclusion"],
-                    "estimated_length": 300,
-                },
+                    "heading": heading.format(kw=target_keyword),
+                    "subheadings": list(subheadings),
+                    "keywords": [k.format(kw=target_keyword) for k in keywords],
+                    "estimated_length": length,
+                }
+                for heading, subheadings, keywords, length in _FALLBACK_OUTLINE_SECTIONS
             ],
             "language": language,
         }
@@ -352,12 +594,4 @@ class StrategyAgent:
         
         
     def detect_search_intent(self, target_keyword: str) -> str:
-        keyword = target_keyword.lower()
-        if any(x in keyword for x in ["buy", "purchase", "order"]):
-            return "transactional"
-        elif any(x in keyword for x in ["best", "top", "reviews"]):
-            return "commercial"
-        elif any(x in keyword for x in ["what is", "how to", "guide"]):
-            return "informational"
-        else:
-            return "informational"  # default
+        return _classify_search_intent(target_keyword)
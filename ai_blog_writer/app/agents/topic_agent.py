@@ -1,11 +1,65 @@
+import asyncio
 import logging
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import orjson
+from cachetools import TTLCache
 from ..clients.ai_clients import  gemini_client
-from pytrends.request import TrendReq
+from ..clients.http_client import http_client
+from ..core.llm_cache import LLMCache
 
 logger = logging.getLogger(__name__)
 
+# Google Trends JSON endpoints (the two calls pytrends makes for related queries)
+TRENDS_HOME_URL = "https://trends.google.com/?geo=US"
+TRENDS_EXPLORE_URL = "https://trends.google.com/trends/api/explore"
+TRENDS_RELATED_URL = "https://trends.google.com/trends/api/widgetdata/relatedsearches"
+TRENDS_HL = "en-US"
+TRENDS_TZ = 360
+
+# Lookups go through the shared HTTP/2 client, so concurrent ones multiplex one
+# connection; its cookie jar holds the NID cookie Trends requires
+TRENDS_TIMEOUT = 5.0
+_trends_cookie_lock = asyncio.Lock()
+_trends_cookie_ready = False
+
+# Lowercased topic -> related queries; TopicAgent is created per request, so
+# the memo lives at module level. Trends move slowly enough for an hour's reuse.
+_trends_cache: TTLCache = TTLCache(maxsize=1024, ttl=3600)
+
+# Raw Gemini topic ideas (before trend decoration). The prompt covers website, title,
+# description and count; reworded title/description match by embedding within the
+# same website and count.
+_topic_llm_cache = LLMCache(maxsize=256, ttl=3600, semantic_threshold=0.92)
+
+
+async def _embed_or_none(text: str) -> Optional[List[float]]:
+    """Embedding for semantic topic matching, or None when the call fails."""
+    try:
+        return await gemini_client.embed(text)
+    except Exception as e:
+        logger.debug("Topic embedding failed, skipping semantic cache: %s", e)
+        return None
+
+
+def _parse_trends_json(body: bytes) -> Any:
+    """Trends prefixes its JSON with an anti-XSSI guard (")]}'" or ")]}',"); strip it."""
+    if body.startswith(b")]}'"):
+        body = body[4:].lstrip(b", \r\n")
+    return orjson.loads(body)
+
+
+async def _ensure_trends_cookie() -> None:
+    """Fetch the NID cookie once; Trends answers 429 to cookieless API calls."""
+    global _trends_cookie_ready
+    if _trends_cookie_ready:
+        return
+    async with _trends_cookie_lock:
+        if not _trends_cookie_ready:
+            await http_client.get(TRENDS_HOME_URL, timeout=TRENDS_TIMEOUT)
+            _trends_cookie_ready = True
+
+
 class TopicAgent:
     """Specialized agent for blog topic ideation and discovery"""
     
@@ -13,8 +67,6 @@ class TopicAgent:
         self.clients = { 
             "gemini": gemini_client,
         }
-        # Pytrends instance
-        self.pytrends = TrendReq(hl='en-US', tz=360)
     
     async def generate_blog_topics(
     self,
@@ -22,22 +74,26 @@ class TopicAgent:
     title: str,
     description: str,
     count: int = 10,
-    include_trends: bool = False
+    include_trends: Optional[bool] = None
 ) -> List[Dict[str, Any]]:
         """
         Generate SEO-optimized blog topic ideas, ensures exactly `count` topics.
+        `include_trends=None` enables trend enrichment when website info exists;
+        pass False to skip the Google Trends lookups entirely.
         """
-        try:
-            
-            include_trends = True  # Auto-include trends if website info exists
+        if include_trends is None:
+            include_trends = bool(website_url and title)
 
+        try:
             prompt = self._build_topic_generation_prompt(
                 website_url, title, description, count
             )
-            print("🔍 [TopicAgent] Prompt sent to Gemini:\n", prompt)
+            logger.debug("[TopicAgent] Prompt sent to Gemini:\n%s", prompt)
 
-            response = await gemini_client.generate_structured(prompt=prompt)
-            print("🔍 [TopicAgent] Raw Gemini response:\n", response)
+            response = await self._generate_topics(
+                prompt, f"{title}\n{description}", website_url, count
+            )
+            logger.debug("[TopicAgent] Raw Gemini response:\n%s", response)
 
                     
             # ✅ Fixed code
@@ -48,30 +104,64 @@ class TopicAgent:
                 topics = topics_data.get("topics", [])
             else:
                 topics = []
-            print("🔍 [TopicAgent] Parsed topics:", topics)
+            logger.debug("[TopicAgent] Parsed topics: %s", topics)
 
-            # Optional: Enhance with trends
-            if include_trends:
-                for topic in topics:
-                    trending_keywords = self.get_trending_keywords(topic["title"], top_n=3)
-                    if trending_keywords:
-                        topic["title"] += f" ({', '.join(trending_keywords)})"
-                        topic["meta_description"] += f" Trending keywords: {', '.join(trending_keywords)}"
+            # Optional: Enhance with trends (all lookups in flight at once)
+            if include_trends and topics:
+                get_trends = self.get_trending_keywords  # bound once for the per-topic fan-out
+                keyword_lists = await asyncio.gather(
+                    *(get_trends(topic["title"], top_n=3) for topic in topics),
+                    return_exceptions=True,
+                )
+                for topic, trending_keywords in zip(topics, keyword_lists):
+                    if trending_keywords and not isinstance(trending_keywords, Exception):
+                        joined = ", ".join(trending_keywords)
+                        topic["title"] = f"{topic['title']} ({joined})"
+                        topic["meta_description"] = f"{topic.get('meta_description', '')} Trending keywords: {joined}"
 
             # 🔹 ENSURE EXACT COUNT
             if len(topics) > count:
                 topics = topics[:count]
             elif len(topics) < count:
-                fallback_topics = self._generate_fallback_topics(title, count - len(topics))
+                fallback_topics = await self._generate_fallback_topics(title, count - len(topics))
                 topics.extend(fallback_topics)
 
             return topics
 
         except Exception as e:
-            logger.error(f"Topic generation failed: {str(e)}")
-            return self._generate_fallback_topics(title, count, include_trends)
+            logger.error("Topic generation failed: %s", e)
+            return await self._generate_fallback_topics(title, count, include_trends=include_trends)
 
     
+    async def _generate_topics(
+        self, prompt: str, semantic_text: str, website_url: str, count: int
+    ) -> Any:
+        """generate_structured behind the exact and semantic topic caches."""
+        model = gemini_client.model
+        cached = _topic_llm_cache.get(model, "", prompt)
+        if cached is not None:
+            return cached
+
+        # Near-duplicate matches only within the same site: one customer's topics
+        # must never be served to another whose title/description read alike
+        site = (website_url or "").strip().lower().rstrip("/")
+        namespace = f"{site}|{count}"
+        # The embedding only gates generation when there is something to match;
+        # otherwise it runs alongside it, just to index the new reply
+        embed_task = asyncio.ensure_future(_embed_or_none(semantic_text))
+        if _topic_llm_cache.has_similar(model, "", namespace):
+            embedding = await embed_task
+            if embedding is not None:
+                cached = _topic_llm_cache.get_similar(model, "", embedding, namespace)
+                if cached is not None:
+                    logger.info("Topic semantic cache hit")
+                    return cached
+
+        response = await gemini_client.generate_structured(prompt=prompt)
+        if response:
+            _topic_llm_cache.set(model, "", prompt, response, await embed_task, namespace)
+        return response
+
     def _build_topic_generation_prompt(
         self,
         website_url: str,
@@ -97,7 +187,7 @@ class TopicAgent:
         - content_angle: Type of content (guide, list, comparison, etc.)
         """
         
-    def _generate_fallback_topics(self, title: str, count: int, include_trends: bool = False) -> List[Dict[str, Any]]:
+    async def _generate_fallback_topics(self, title: str, count: int, include_trends: bool = False) -> List[Dict[str, Any]]:
         """Generate fallback topics when AI fails"""
         base_topics = [
             {
@@ -117,7 +207,7 @@ class TopicAgent:
         ]
 
         if include_trends:
-            trending_keywords = self.get_trending_keywords(title, top_n=3)
+            trending_keywords = await self.get_trending_keywords(title, top_n=3)
             for kw in trending_keywords:
                 base_topics.append({
                     "title": f"{title} Trends: {kw}",
@@ -129,17 +219,65 @@ class TopicAgent:
 
         return base_topics[:count]
     
-    def get_trending_keywords(self, topic: str, top_n: int = 5) -> List[str]:
+    async def get_trending_keywords(self, topic: str, top_n: int = 5) -> List[str]:
         """Fetch trending keywords related to the topic from Google Trends"""
+        key = topic.strip().lower()
+        cached = _trends_cache.get(key)
+        if cached is not None:
+            return cached[:top_n]
+
         try:
-            self.pytrends.build_payload([topic], timeframe='now 7-d')
-            
-            trending = self.pytrends.related_queries().get(topic, {}).get('top', [])
-            if trending is not None and isinstance(trending, dict) and 'query' in trending:
-                return trending['query'].tolist()[:top_n]
+            keywords = await self._fetch_trending_keywords(topic)
+        except Exception as e:
+            logger.warning("Failed to fetch trending keywords for '%s': %s", topic, e)
             return []
 
-            # return trending['query'].tolist()[:top_n] if trending is not None else []
-        except Exception as e:
-            logger.warning(f"Failed to fetch trending keywords for '{topic}': {e}")
+        _trends_cache[key] = keywords
+        return keywords[:top_n]
+
+    @staticmethod
+    async def _fetch_trending_keywords(topic: str) -> List[str]:
+        """Top related queries for the topic over the last 7 days."""
+        await _ensure_trends_cookie()
+
+        # 1. Explore: returns the widgets (with request + token) for this comparison
+        explore_req = {
+            "comparisonItem": [{"keyword": topic, "time": "now 7-d", "geo": ""}],
+            "category": 0,
+            "property": "",
+        }
+        response = await http_client.post(
+            TRENDS_EXPLORE_URL,
+            timeout=TRENDS_TIMEOUT,
+            params={
+                "hl": TRENDS_HL,
+                "tz": TRENDS_TZ,
+                "req": orjson.dumps(explore_req).decode(),
+            },
+        )
+        response.raise_for_status()
+        widget = next(
+            (
+                w for w in _parse_trends_json(response.content).get("widgets", [])
+                if w.get("id", "").startswith("RELATED_QUERIES")
+            ),
+            None,
+        )
+        if widget is None:
             return []
+
+        # 2. Related queries for that widget
+        response = await http_client.get(
+            TRENDS_RELATED_URL,
+            timeout=TRENDS_TIMEOUT,
+            params={
+                "hl": TRENDS_HL,
+                "tz": TRENDS_TZ,
+                "req": orjson.dumps(widget["request"]).decode(),
+                "token": widget["token"],
+            },
+        )
+        response.raise_for_status()
+        ranked = _parse_trends_json(response.content).get("default", {}).get("rankedList", [])
+        top = ranked[0].get("rankedKeyword", []) if ranked else []
+        return [item["query"] for item in top if item.get("query")]
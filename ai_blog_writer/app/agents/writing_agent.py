@@ -1,26 +1,166 @@
 import asyncio
+import copy
+import functools
+import hashlib
 import logging
-import json
 import re
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import string
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import orjson
+from fastapi import HTTPException
 from ..clients.ai_clients import gemini_client 
+from ..core.clock import now_iso
+from ..core.config import settings
+from ..core.llm_cache import LLMCache
 
 logger = logging.getLogger(__name__)
 
+_TAG_RE = re.compile(r'<[^>]+>')
+# Tags (group 1) and [citation] markers in one alternation, for the single-pass draft scan
+_SCAN_RE = re.compile(r'(<[^>]+>)|\[citation\]', re.IGNORECASE)
+
+# Gemini replies for section and single-prompt drafts, keyed by the exact prompt.
+# Prompts are deterministic in the strategy, so retries and re-runs reuse them.
+_writing_llm_cache = LLMCache(maxsize=1024, ttl=86400)
+
+
+@functools.lru_cache(maxsize=128)
+def _count_words(text: str) -> int:
+    """Whitespace-delimited words of `text`, ignoring HTML tags."""
+    return len(_TAG_RE.sub(" ", text).split())
+
+
+def _scan_html(content: str) -> Tuple[int, List[Dict]]:
+    """
+    Word count (tags ignored, as in _count_words) and the claims after each
+    [citation] marker, from one regex pass over the draft.
+    """
+    text_parts = []
+    markers = []  # (start, end) of each [citation] marker
+    pos = 0
+    for match in _SCAN_RE.finditer(content):
+        if match.group(1):
+            text_parts.append(content[pos:match.start()])
+            text_parts.append(" ")
+            pos = match.end()
+        else:
+            markers.append(match.span())
+    text_parts.append(content[pos:])
+    word_count = len("".join(text_parts).split())
+
+    # A claim runs from its marker to the next marker (or the end)
+    citations = []
+    for i, (start, end) in enumerate(markers):
+        claim_end = markers[i + 1][0] if i + 1 < len(markers) else len(content)
+        claim = content[end:claim_end].strip()
+        if claim and len(claim) > 10:
+            citations.append({
+                "claim": claim,
+                "context": content[max(0, start - 100):min(len(content), claim_end + 100)],
+                "original_marker": f"[citation]{claim}"
+            })
+    return word_count, citations
+
+
+@functools.lru_cache(maxsize=256)
+def _format_items(items: Tuple, item_type: str) -> str:
+    """Cached body of BlogWritingAgent._format_list (every section prompt repeats the same lists)."""
+    if not items:
+        return f"No {item_type}s identified."
+    
+    # FILTER OUT None VALUES
+    valid_items = [item for item in items if item is not None]
+    
+    if not valid_items:
+        return f"No valid {item_type}s identified."
+    
+    return "\n".join([f"- {item}" for item in valid_items[:10]])
+
+
+class _PromptTemplate:
+    """
+    A str.format template split into literal segments and field names once, so
+    rendering is a single join. Field values are callables, evaluated only for
+    fields the template actually uses.
+    """
+
+    def __init__(self, segments: List[Tuple[str, Optional[str]]]):
+        self._segments = segments
+        self.fields = frozenset(field for _, field in segments if field)
+
+    @classmethod
+    def parse(cls, template: str) -> "_PromptTemplate":
+        segments = []
+        for literal, field, spec, conversion in string.Formatter().parse(template):
+            if spec or conversion:
+                raise ValueError(f"Unsupported format spec in prompt field {{{field}}}")
+            segments.append((literal, field))
+        return cls(segments)
+
+    def partial(self, fields: Dict[str, Callable[[], Any]]) -> "_PromptTemplate":
+        """A template with the given fields baked into its literal text."""
+        values = {name: str(fields[name]()) for name in self.fields & fields.keys()}
+        segments = []
+        literal_parts = []
+        for literal, field in self._segments:
+            literal_parts.append(literal)
+            if field in values:
+                literal_parts.append(values[field])
+            elif field:
+                segments.append(("".join(literal_parts), field))
+                literal_parts = []
+        segments.append(("".join(literal_parts), None))
+        return _PromptTemplate(segments)
+
+    def render(self, fields: Dict[str, Callable[[], Any]]) -> str:
+        values = {name: str(fields[name]()) for name in self.fields}
+        parts = []
+        append = parts.append
+        for literal, field in self._segments:
+            append(literal)
+            if field:
+                append(values[field])
+        return "".join(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_template(template: str) -> _PromptTemplate:
+    return _PromptTemplate.parse(template)
+
+
+def _strategy_key(content_strategy: Dict) -> str:
+    """Stable digest of a content strategy (key order independent)."""
+    raw = orjson.dumps(
+        content_strategy, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+    )
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
 class BlogWritingAgent:
     """
     Blog Writing Agent - Generates complete blog content based on strategy data.
     Now supports both single-prompt and section-by-section generation modes with strict word count control.
     """
     
-    def __init__(self, use_section_generation: bool = True):
+    def __init__(self, use_section_generation: bool = True, use_batch_api: Optional[bool] = None):
         self.use_section_generation = use_section_generation
+        # Section-wise mode only: submit all sections as one Gemini batch job
+        self.use_batch_api = settings.gemini_batch_sections if use_batch_api is None else use_batch_api
         
         # NEW: Word count configuration for strict control
         self.target_word_range = (2800, 3000)  # min, max words
         self.section_buffer_factor = 0.9  # Aim for 90% of target to account for AI variance
         self.allowed_word_variance = 0.1  # 10% variance per section
+        self.max_section_concurrency = 8  # in-flight Gemini calls in section-wise mode
+        self.section_overshoot_factor = 1.5  # abort a section stream past 150% of its max words
+        self.retry_out_of_range_sections = True  # re-prompt once when a section misses its word range
+        self.rate_limit_retries = 3  # waits on a 429 before a section falls back to placeholder prose
+
+        # (strategy digest, tone) -> single-prompt text, for retries of the same strategy
+        self._prompt_cache: Dict[Tuple[str, str], str] = {}
+        self._prompt_cache_size = 32
+        # strategy digest -> (outline JSON, competitor summary); shared by every tone
+        self._strategy_fragments: Dict[str, Tuple[str, str]] = {}
 
     # Consolidated prompt template for single-generation mode (backward compatible)
     BLOG_WRITING_PROMPT_TEMPLATE = """
@@ -142,9 +282,8 @@ Return JSON with:
                 result = await self._generate_single_prompt(content_strategy, tone, task_id)
             
             # Ensure backward compatibility - same return structure
-            validated_content = self._validate_and_enhance_content(result, content_strategy)
-            citations_needed = self._extract_citation_needs(validated_content["content"])
-            validated_content = await self.optimize_content(validated_content, seo_guidelines=None)
+            validated_content = self._finalize(result, content_strategy, seo_guidelines=None)
+            citations_needed = validated_content.pop("citations_needed")
             
             # NEW: Final word count validation
             final_word_count = validated_content.get("word_count", 0)
@@ -185,41 +324,69 @@ Return JSON with:
         section_targets = [int(t * EXPANSION_FACTOR) for t in section_targets]
 
                 
-        generated_sections = []
-        previous_content = ""
-        total_actual_words = 0
-        
-        for i, section in enumerate(sections):
-            logger.info(f"Generating section {i+1}/{len(sections)}: {section.get('heading', 'Unknown')}")
-            
-            section_content = await self._generate_section(
-                section=section,
-                section_number=i+1,
-                content_strategy=content_strategy,
-                tone=tone,
-                previous_content=previous_content,
-                target_word_count=section_targets[i],  # NEW: Pass specific word count
-                task_id=task_id
+        # Sections only see the previous *heading* (not its prose), so they are
+        # independent and can all be requested at once. Tails are cut to the
+        # 500-char prompt budget here, once.
+        previous_tails = [""] + [
+            f'The previous section is titled "{section.get("heading", "")}".'[-500:] if section.get("heading") else ""
+            for section in sections[:-1]
+        ]
+
+        section_template = self._section_template(content_strategy, tone)
+
+        generated_sections = None
+        if self.use_batch_api and len(sections) > 1:
+            try:
+                generated_sections = await self._generate_sections_batch(
+                    sections, content_strategy, tone, previous_tails, section_targets, task_id,
+                    template=section_template
+                )
+            except Exception as e:
+                logger.warning(f"Batch section generation failed, using per-section requests: {e}")
+
+        if generated_sections is None:
+            generated_sections = await self._generate_sections_bounded(
+                range(len(sections)), sections, content_strategy, tone, previous_tails,
+                section_targets, task_id, section_template
             )
-            
-            generated_sections.append(section_content)
-            previous_content = section_content.get("content", "")
-            total_actual_words += section_content.get("word_count", 0)
-            
-            # NEW: Log progress towards word count goal
+
+        for i, section_content in enumerate(generated_sections):
             logger.info(f"Section {i+1} word count: {section_content.get('word_count', 0)} (target: {section_targets[i]})")
-            logger.info(f"Total so far: {total_actual_words} / {target_total}")
-            
-            # Small delay between sections to avoid rate limiting
-            if i < len(sections) - 1:
-                await asyncio.sleep(1)
-        
+        total_actual_words = sum(section.get("word_count", 0) for section in generated_sections)
+        logger.info(f"Total: {total_actual_words} / {target_total}")
+
         # NEW: Final word count validation and adjustment
         return self._combine_and_adjust_sections(generated_sections, content_strategy, total_actual_words)
 
+    async def _generate_sections_bounded(self, indices, sections: List[Dict], content_strategy: Dict, tone: str,
+                                         previous_tails: List[str], section_targets: List[int],
+                                         task_id: Optional[str] = None,
+                                         template: Optional[_PromptTemplate] = None) -> List[Dict]:
+        """Per-section requests for `indices`, at most max_section_concurrency in flight, in index order."""
+        semaphore = asyncio.Semaphore(self.max_section_concurrency)
+
+        async def _generate_one(i: int) -> Dict:
+            section = sections[i]
+            async with semaphore:
+                logger.info(f"Generating section {i+1}/{len(sections)}: {section.get('heading', 'Unknown')}")
+                return await self._generate_section(
+                    section=section,
+                    section_number=i+1,
+                    content_strategy=content_strategy,
+                    tone=tone,
+                    previous_tail=previous_tails[i],
+                    target_word_count=section_targets[i],  # NEW: Pass specific word count
+                    task_id=task_id,
+                    template=template
+                )
+
+        # gather keeps results in the order of `indices`
+        return await asyncio.gather(*(_generate_one(i) for i in indices))
+
     def _calculate_section_word_targets(self, sections: List[Dict], total_target: int) -> List[int]:
         """Calculate word count targets for each section based on their estimated lengths."""
-        total_estimated = sum(section.get("estimated_length", 400) for section in sections)
+        lengths = [section.get("estimated_length", 400) for section in sections]
+        total_estimated = sum(lengths)
         
         if total_estimated == 0:
             # Fallback: equal distribution
@@ -227,86 +394,221 @@ Return JSON with:
             return [total_target // section_count] * section_count
         
         # Distribute words proportionally to estimated lengths
-        targets = []
-        for section in sections:
-            proportion = section.get("estimated_length", 400) / total_estimated
-            targets.append(int(total_target * proportion))
+        targets = [int(total_target * (length / total_estimated)) for length in lengths]
         
         # Ensure total matches target (adjust for rounding)
-        total_assigned = sum(targets)
-        if total_assigned != total_target:
-            difference = total_target - total_assigned
+        difference = total_target - sum(targets)
+        if difference and targets:
             # Distribute difference to largest section
-            if targets:
-                max_index = targets.index(max(targets))
-                targets[max_index] += difference
+            targets[targets.index(max(targets))] += difference
         
         return targets
 
+    async def _generate_sections_batch(self, sections: List[Dict], content_strategy: Dict, tone: str,
+                                       previous_tails: List[str], section_targets: List[int],
+                                       task_id: Optional[str] = None,
+                                       template: Optional[_PromptTemplate] = None) -> List[Dict]:
+        """
+        Draft every section in one Gemini Batch API job (half the token price).
+        Sections the job returned nothing for are retried as normal requests.
+        """
+        model = gemini_client.model
+        prompts = [
+            self._build_section_prompt(section, i+1, content_strategy, tone, previous_tails[i], section_targets[i], template)
+            for i, section in enumerate(sections)
+        ]
+        results = [_writing_llm_cache.get(model, "", prompt) for prompt in prompts]
+        pending = [i for i, result in enumerate(results) if result is None]
+
+        if pending:
+            logger.info(f"Submitting {len(pending)} sections as one Gemini batch job")
+            batch_results = await gemini_client.generate_structured_batch(
+                [prompts[i] for i in pending], timeout=settings.gemini_batch_timeout
+            )
+            for i, section_data in zip(pending, batch_results):
+                if isinstance(section_data, dict) and section_data.get("content"):
+                    _writing_llm_cache.set(model, "", prompts[i], section_data)
+                results[i] = section_data
+
+        missing = [
+            i for i, section_data in enumerate(results)
+            if not (isinstance(section_data, dict) and section_data.get("content"))
+        ]
+        if missing:
+            logger.info(f"Batch returned nothing for {len(missing)} sections, requesting them directly")
+            retried = await self._generate_sections_bounded(
+                missing, sections, content_strategy, tone, previous_tails, section_targets, task_id, template
+            )
+        else:
+            retried = []
+        retried_by_index = dict(zip(missing, retried))
+
+        return [
+            retried_by_index[i] if i in retried_by_index
+            else self._finalize_section(results[i], section, i+1, section_targets[i])
+            for i, section in enumerate(sections)
+        ]
+
+    def _section_template(self, content_strategy: Dict, tone: str) -> _PromptTemplate:
+        """The section template with this blog's fixed fields (topic, tone, research) filled in."""
+        research_data = content_strategy.get("research_data", {})
+        return _compile_template(self.SECTION_WRITING_PROMPT_TEMPLATE).partial({
+            "topic": lambda: content_strategy.get("topic", ""),
+            "target_keyword": lambda: content_strategy.get("target_keyword", ""),
+            "tone": lambda: tone,
+            "common_questions": lambda: self._format_list(research_data.get("common_questions", [])[:3], "question"),
+            "content_gaps": lambda: self._format_list(research_data.get("content_gaps", [])[:2], "gap"),
+        })
+
+    def _build_section_prompt(self, section: Dict, section_number: int, content_strategy: Dict,
+                              tone: str, previous_tail: str, target_word_count: int,
+                              template: Optional[_PromptTemplate] = None) -> str:
+        """`template` is a prebuilt _section_template, shared by all sections of a blog."""
+        template = template or self._section_template(content_strategy, tone)
+        allowed_variance = target_word_count * self.allowed_word_variance
+        return template.render({
+            "section_number": lambda: section_number,
+            "section_heading": lambda: section.get("heading", ""),
+            "previous_section_content": lambda: previous_tail or "This is the first section.",
+            "section_word_count": lambda: target_word_count,  # Use calculated target
+            "min_allowed": lambda: int(target_word_count - allowed_variance),
+            "max_allowed": lambda: int(target_word_count + allowed_variance),
+            "section_keywords": lambda: ", ".join(section.get("keywords", [])),
+        })
+
+    def _finalize_section(self, section_data: Dict, section: Dict, section_number: int,
+                          target_word_count: int) -> Dict:
+        """Validate a generated section's word count and fill in required fields."""
+        # VALIDATE WORD COUNT
+        actual_words = section_data.get("word_count", 0)
+        allowed_variance = target_word_count * self.allowed_word_variance
+        min_allowed = target_word_count - allowed_variance
+        max_allowed = target_word_count + allowed_variance
+        
+        if actual_words < min_allowed or actual_words > max_allowed:
+            logger.warning(f"Section {section_number} word count {actual_words} outside range {min_allowed}-{max_allowed}")
+        
+        # Ensure section has required fields
+        section_data.setdefault("heading", section.get("heading", ""))
+        section_data.setdefault("content", "")
+        section_data.setdefault("word_count", actual_words)
+        
+        return section_data
+
     # UPDATED: Section generation with word count validation
     async def _generate_section(self, section: Dict, section_number: int, content_strategy: Dict, 
-                              tone: str, previous_content: str, target_word_count: int, 
-                              task_id: Optional[str] = None) -> Dict:
+                              tone: str, previous_tail: str, target_word_count: int, 
+                              task_id: Optional[str] = None,
+                              template: Optional[_PromptTemplate] = None) -> Dict:
         """Generate a single section with word count validation."""
-        prompt = self.SECTION_WRITING_PROMPT_TEMPLATE.format(
-            section_number=section_number,
-            section_heading=section.get("heading", ""),
-            topic=content_strategy.get("topic", ""),
-            target_keyword=content_strategy.get("target_keyword", ""),
-            previous_section_content=previous_content[-500:] if previous_content else "This is the first section.",
-            section_word_count=target_word_count,  # Use calculated target
-            tone=tone,
-            section_keywords=", ".join(section.get("keywords", [])),
-            common_questions=self._format_list(
-                content_strategy.get("research_data", {}).get("common_questions", [])[:3], 
-                "question"
-            ),
-            content_gaps=self._format_list(
-                content_strategy.get("research_data", {}).get("content_gaps", [])[:2], 
-                "gap"
-            )
+        template = template or self._section_template(content_strategy, tone)
+        prompt = self._build_section_prompt(
+            section, section_number, content_strategy, tone, previous_tail, target_word_count, template
         )
         
+        # Stream the reply and stop generation once the section runs far past its budget
+        word_cap = target_word_count * (1 + self.allowed_word_variance) * self.section_overshoot_factor
+
         try:
-            section_data = await gemini_client.generate_structured(prompt=prompt) 
-            
-            # VALIDATE WORD COUNT
-            actual_words = section_data.get("word_count", 0)
+            section_data = await self._request_section(prompt, section_number, word_cap)
+
+            # One corrective re-prompt when the measured length misses the allowed range
+            actual_words = self._count_words(section_data.get("content", ""))
             allowed_variance = target_word_count * self.allowed_word_variance
-            min_allowed = target_word_count - allowed_variance
-            max_allowed = target_word_count + allowed_variance
-            
-            if actual_words < min_allowed or actual_words > max_allowed:
-                logger.warning(f"Section {section_number} word count {actual_words} outside range {min_allowed}-{max_allowed}")
-            
-            # Ensure section has required fields
-            section_data.setdefault("heading", section.get("heading", ""))
-            section_data.setdefault("content", "")
-            section_data.setdefault("word_count", actual_words)
-            
-            return section_data
+            if self.retry_out_of_range_sections and actual_words and abs(actual_words - target_word_count) > allowed_variance:
+                # Scale the ask by how far off the model was, within 0.5x-2x of the target
+                adjusted_target = int(min(max(target_word_count ** 2 / actual_words, target_word_count * 0.5), target_word_count * 2))
+                logger.info(f"Section {section_number} has {actual_words} words (target {target_word_count}), re-prompting for {adjusted_target}")
+                retry_prompt = self._build_section_prompt(
+                    section, section_number, content_strategy, tone, previous_tail, adjusted_target, template
+                )
+                try:
+                    retry_data = await self._request_section(retry_prompt, section_number, word_cap)
+                except Exception as e:
+                    logger.warning(f"Section {section_number} re-prompt failed: {e}")
+                else:
+                    retry_words = self._count_words(retry_data.get("content", ""))
+                    if retry_words and abs(retry_words - target_word_count) < abs(actual_words - target_word_count):
+                        section_data = retry_data
+
+            return self._finalize_section(section_data, section, section_number, target_word_count)
             
         except Exception as e:
             logger.error(f"Section generation failed: {str(e)}")
             return self._generate_fallback_section(section, content_strategy, target_word_count)
 
+    async def _with_rate_limit_retry(self, call: Callable[[], Any], section_number: int) -> Any:
+        """Wait out a Redis rate-limit 429 and try again rather than falling back to placeholder prose."""
+        for attempt in range(self.rate_limit_retries + 1):
+            try:
+                return await call()
+            except HTTPException as e:
+                if e.status_code != 429 or attempt == self.rate_limit_retries:
+                    raise
+                detail = e.detail if isinstance(e.detail, dict) else {}
+                delay = min(detail.get("retry_after_seconds", 5), 60)
+                logger.warning(f"Section {section_number} rate limited, retrying in {delay}s")
+                await asyncio.sleep(delay)
+
+    async def _request_section(self, prompt: str, section_number: int, word_cap: float) -> Dict:
+        """Cached, streamed section request; generation stops once the content passes `word_cap` words."""
+        model = gemini_client.model
+        section_data = _writing_llm_cache.get(model, "", prompt)
+        if section_data is not None:
+            return section_data
+
+        # Running count: each call only tokenizes text up to the newest tag end ('>'),
+        # which acts as a word boundary, so the streamed content is scanned once.
+        counted_words = 0
+        counted_upto = 0
+
+        def _within_budget(content_so_far: str) -> bool:
+            nonlocal counted_words, counted_upto
+            boundary = content_so_far.rfind(">") + 1
+            if boundary > counted_upto:
+                counted_words += len(_TAG_RE.sub(" ", content_so_far[counted_upto:boundary]).split())
+                counted_upto = boundary
+            pending_words = len(content_so_far[counted_upto:].split())
+            return counted_words + pending_words <= word_cap
+
+        section_data = await self._with_rate_limit_retry(
+            lambda: gemini_client.generate_structured_watched(
+                prompt=prompt, field="content", on_progress=_within_budget
+            ),
+            section_number,
+        )
+        if section_data.pop("truncated", False):
+            logger.warning(f"Section {section_number} exceeded {int(word_cap)} words, stopped generation early")
+            content = section_data["content"]
+            last_paragraph_end = content.rfind("</p>")
+            if last_paragraph_end != -1:  # don't end mid-paragraph
+                content = content[:last_paragraph_end + 4]
+            section_data["content"] = content
+            section_data["word_count"] = self._count_words(content)
+        if section_data.get("content"):
+            _writing_llm_cache.set(model, "", prompt, section_data)
+        return section_data
+
     def _combine_and_adjust_sections(self, sections: List[Dict], content_strategy: Dict, total_words: int) -> Dict:
         """Combine sections and adjust if word count is outside target range."""
         min_target, max_target = self.target_word_range
         
         if total_words > max_target:
             logger.warning(f"Blog too long ({total_words} words), trimming content")
-            sections = self._trim_sections(sections, total_words - max_target)
+            sections = self._trim_sections(sections, total_words - max_target, total_words)
         
-        return self._combine_sections(sections, content_strategy)
+        # Trimming only marks sections, so the total still holds
+        return self._combine_sections(sections, content_strategy, total_words)
 
-    def _expand_sections(self, sections: List[Dict], words_needed: int) -> List[Dict]:
-        """Expand sections to meet minimum word count."""
+    def _expand_sections(self, sections: List[Dict], words_needed: int,
+                         total_current: Optional[int] = None) -> List[Dict]:
+        """Expand sections to meet minimum word count. Pass `total_current` if already summed."""
         if not sections or words_needed <= 0:
             return sections
         
         # Add words proportionally to existing sections
-        total_current = sum(section.get("word_count", 0) for section in sections)
+        if total_current is None:
+            total_current = sum(section.get("word_count", 0) for section in sections)
         if total_current == 0:
             return sections
             
@@ -323,13 +625,15 @@ Return JSON with:
         
         return expanded_sections
 
-    def _trim_sections(self, sections: List[Dict], words_to_remove: int) -> List[Dict]:
-        """Trim sections to meet maximum word count."""
+    def _trim_sections(self, sections: List[Dict], words_to_remove: int,
+                       total_current: Optional[int] = None) -> List[Dict]:
+        """Trim sections to meet maximum word count. Pass `total_current` if already summed."""
         if not sections or words_to_remove <= 0:
             return sections
         
         # Remove words proportionally from existing sections
-        total_current = sum(section.get("word_count", 0) for section in sections)
+        if total_current is None:
+            total_current = sum(section.get("word_count", 0) for section in sections)
         if total_current == 0:
             return sections
             
@@ -346,16 +650,18 @@ Return JSON with:
         
         return trimmed_sections
 
-    def _combine_sections(self, sections: List[Dict], content_strategy: Dict) -> Dict:
-        """Combine generated sections into a complete blog draft."""
-        full_content = ""
-        total_word_count = 0
-        
+    def _combine_sections(self, sections: List[Dict], content_strategy: Dict,
+                          total_word_count: Optional[int] = None) -> Dict:
+        """Combine generated sections into a complete blog draft. Pass `total_word_count` if already summed."""
+        if total_word_count is None:
+            total_word_count = sum(section.get("word_count", 0) for section in sections)
+
+        parts = []
+        append = parts.append
         for i, section in enumerate(sections):
             heading_level = "h1" if i == 0 else "h2"
-            full_content += f'<{heading_level}>{section["heading"]}</{heading_level}>\n'
-            full_content += f'{section["content"]}\n\n'
-            total_word_count += section.get("word_count", 0)
+            append(f'<{heading_level}>{section["heading"]}</{heading_level}>\n{section["content"]}\n\n')
+        full_content = "".join(parts)
         
         # Create the final blog structure (maintaining backward compatibility)
         return {
@@ -371,38 +677,65 @@ Return JSON with:
     async def _generate_single_prompt(self, content_strategy: Dict, tone: str, task_id: Optional[str] = None) -> Dict:
         """Original single-prompt generation method - maintained for backward compatibility."""
         prompt = self._build_writing_prompt(content_strategy, tone)
-        content = await gemini_client.generate_structured(prompt=prompt)   
+        model = gemini_client.model
+        content = _writing_llm_cache.get(model, "", prompt)
+        if content is None:
+            content = await gemini_client.generate_structured(prompt=prompt)   
+            if content:
+                _writing_llm_cache.set(model, "", prompt, content)
         return content
 
     # ALL ORIGINAL METHODS MAINTAINED FOR BACKWARD COMPATIBILITY
     def _build_writing_prompt(self, content_strategy: Dict, tone: str) -> str:
         """Build comprehensive writing prompt with all strategy data."""
-        topic = content_strategy.get("topic", "")
-        target_keyword = content_strategy.get("target_keyword", "")
-        search_intent = content_strategy.get("search_intent", "informational")
-        language = "en"
-        
-        competitor_analysis = content_strategy.get("competitor_analysis", {})
-        common_questions = content_strategy.get("research_data", {}).get("common_questions", [])
-        semantic_keywords = content_strategy.get("research_data", {}).get("semantic_keywords", [])
-        content_gaps = content_strategy.get("research_data", {}).get("content_gaps", [])
+        strategy_key = _strategy_key(content_strategy)
+        key = (strategy_key, tone)
+        prompt = self._prompt_cache.get(key)
+        if prompt is None:
+            prompt = self._format_writing_prompt(content_strategy, tone, strategy_key)
+            if len(self._prompt_cache) >= self._prompt_cache_size:
+                self._prompt_cache.pop(next(iter(self._prompt_cache)))  # oldest first
+            self._prompt_cache[key] = prompt
+        return prompt
+
+    def _strategy_fragments_for(self, content_strategy: Dict, strategy_key: str) -> Tuple[str, str]:
+        """Encoded outline and competitor summary, built once per strategy digest."""
+        fragments = self._strategy_fragments.get(strategy_key)
+        if fragments is None:
+            fragments = (
+                # Compact JSON: indentation only adds prompt tokens
+                orjson.dumps(content_strategy.get("outline", {}), option=orjson.OPT_NON_STR_KEYS, default=str).decode(),
+                self._format_competitor_analysis(content_strategy.get("competitor_analysis", {})),
+            )
+            if len(self._strategy_fragments) >= self._prompt_cache_size:
+                self._strategy_fragments.pop(next(iter(self._strategy_fragments)))  # oldest first
+            self._strategy_fragments[strategy_key] = fragments
+        return fragments
+
+    def _format_writing_prompt(self, content_strategy: Dict, tone: str, strategy_key: Optional[str] = None) -> str:
+        research_data = content_strategy.get("research_data", {})
         outline = content_strategy.get("outline", {})
-        
         word_count = outline.get("word_count_target", 2500)
-        
-        return self.BLOG_WRITING_PROMPT_TEMPLATE.format(
-            topic=topic,
-            target_keyword=target_keyword,
-            search_intent=search_intent,
-            language=language,
-            word_count=word_count,
-            tone=tone,
-            competitor_analysis=self._format_competitor_analysis(competitor_analysis),
-            common_questions=self._format_list(common_questions[:8], "question"),
-            semantic_keywords=self._format_list(semantic_keywords[:15], "keyword"),
-            content_gaps=self._format_list(content_gaps[:5], "gap"),
-            outline=json.dumps(outline, ensure_ascii=False, indent=2)
+        encoded_outline, competitor_summary = self._strategy_fragments_for(
+            content_strategy, strategy_key or _strategy_key(content_strategy)
         )
+        
+        return _compile_template(self.BLOG_WRITING_PROMPT_TEMPLATE).render({
+            "topic": lambda: content_strategy.get("topic", ""),
+            "target_keyword": lambda: content_strategy.get("target_keyword", ""),
+            "search_intent": lambda: content_strategy.get("search_intent", "informational"),
+            "language": lambda: "en",
+            "word_count": lambda: word_count,
+            # The template asks for the ±20% band around the target explicitly
+            "min_word_count": lambda: int(word_count * 0.8),
+            "max_word_count": lambda: int(word_count * 1.2),
+            "tone": lambda: tone,
+            "competitor_analysis": lambda: competitor_summary,
+            "common_questions": lambda: self._format_list(research_data.get("common_questions", [])[:8], "question"),
+            "semantic_keywords": lambda: self._format_list(research_data.get("semantic_keywords", [])[:15], "keyword"),
+            "content_gaps": lambda: self._format_list(research_data.get("content_gaps", [])[:5], "gap"),
+            "outline": lambda: encoded_outline,
+        })
 
     def _format_competitor_analysis(self, analysis: Dict) -> str:
         """Format competitor analysis for prompt."""
@@ -429,19 +762,16 @@ Return JSON with:
 
     def _format_list(self, items: List, item_type: str) -> str:
         """Format a list of items for the prompt with null-safety."""
-        if not items:
-            return f"No {item_type}s identified."
-        
-        # FILTER OUT None VALUES
-        valid_items = [item for item in items if item is not None]
-        
-        if not valid_items:
-            return f"No valid {item_type}s identified."
-        
-        return "\n".join([f"- {item}" for item in valid_items[:10]])
+        try:
+            return _format_items(tuple(items or ()), item_type)
+        except TypeError:  # unhashable items (e.g. dicts): format without the cache
+            return _format_items.__wrapped__(tuple(items or ()), item_type)
 
-    def _validate_and_enhance_content(self, content: Dict, strategy: Dict) -> Dict:
-        """Validate and enhance the generated content."""
+    def _finalize(self, content: Dict, strategy: Dict, seo_guidelines: Optional[Dict] = None) -> Dict:
+        """
+        Validate, enhance and SEO-optimize the generated content in one pass.
+        Mutates and returns `content`.
+        """
         required_fields = ["title", "content", "meta_description"]
         for field in required_fields:
             if field not in content:
@@ -450,40 +780,25 @@ Return JSON with:
         content["target_keyword"] = strategy.get("target_keyword")
         content["search_intent"] = strategy.get("search_intent")
         content["language"] = strategy.get("language", "en")
-        content["word_count"] = self._count_words(content.get("content", ""))
+        # One scan of the final HTML yields both the word count and the citation needs
+        content["word_count"], content["citations_needed"] = _scan_html(content.get("content") or "")
         
         if "keywords" not in content:
             semantic_keywords = strategy.get("research_data", {}).get("semantic_keywords", [])
             content["keywords"] = [strategy.get("target_keyword")] + semantic_keywords[:4]
         
-        return content
+        return self._apply_seo_guidelines(content, seo_guidelines)
 
     def _extract_citation_needs(self, content: str) -> List[Dict]:
         """Extract claims that need citation from content."""
-        citations_needed = []
-        citation_pattern = r'\[citation\](.*?)(?=\[citation\]|$)'
-        matches = re.finditer(citation_pattern, content, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
-            claim = match.group(1).strip()
-            if claim and len(claim) > 10:
-                start = max(0, match.start() - 100)
-                end = min(len(content), match.end() + 100)
-                context = content[start:end]
-                
-                citations_needed.append({
-                    "claim": claim,
-                    "context": context,
-                    "original_marker": f"[citation]{claim}"
-                })
-        
-        return citations_needed
+        return _scan_html(content)[1]
 
     def _count_words(self, text: str) -> int:
         """Count words in text."""
         if not text:
             return 0
-        return len(re.findall(r'\w+', text))
+        # Memoized on the text itself: validation and fallbacks recount the same drafts
+        return _count_words(text)
 
     def _generate_fallback_field(self, field: str, strategy: Dict) -> str:
         """Generate fallback content for missing fields."""
@@ -513,8 +828,8 @@ Return JSON with:
             words_needed = target_word_count - base_words
             # Add placeholder sentences (approx 15 words each)
             sentences_needed = max(1, words_needed // 15)
-            for _ in range(sentences_needed):
-                additional_content += f" <p>Additional information about {section.get('heading', 'this topic')} would be covered here. [citation]More details require verification[citation].</p>"
+            placeholder = f" <p>Additional information about {section.get('heading', 'this topic')} would be covered here. [citation]More details require verification[citation].</p>"
+            additional_content = placeholder * sentences_needed
         
         full_content = base_content + additional_content
         
@@ -562,28 +877,36 @@ Return JSON with:
             "status": "fallback_draft", 
         }
 
-    async def optimize_content(self, draft: Dict, seo_guidelines: Optional[Dict] = None) -> Dict:
+    async def optimize_content(self, draft: Dict, seo_guidelines: Optional[Dict] = None,
+                               in_place: bool = True) -> Dict:
         """
         Optimize the generated content based on SEO guidelines.
         Maintains backward compatibility with existing calls.
+
+        Mutates and returns `draft` (its sections included); pass
+        `in_place=False` to work on a deep copy instead.
         """
-        optimized = draft.copy()
+        if not in_place:
+            draft = copy.deepcopy(draft)
+        return self._apply_seo_guidelines(draft, seo_guidelines)
 
+    def _apply_seo_guidelines(self, draft: Dict, seo_guidelines: Optional[Dict]) -> Dict:
+        """Apply SEO guidelines to `draft` in place and stamp it as optimized."""
         if seo_guidelines:
             target_keyword = seo_guidelines.get("target_keyword")
             if target_keyword:
-                optimized["title"] = f"{optimized.get('title', target_keyword)} | {target_keyword}"
-                optimized["meta_description"] = f"{optimized.get('meta_description', '')} | Learn about {target_keyword}."
+                draft["title"] = f"{draft.get('title', target_keyword)} | {target_keyword}"
+                draft["meta_description"] = f"{draft.get('meta_description', '')} | Learn about {target_keyword}."
 
             semantic_keywords = seo_guidelines.get("semantic_keywords", [])
-            for section in optimized.get("sections", []):
+            for section in draft.get("sections", []):
                 section["keywords_used"] = list(set(section.get("keywords_used", []) + semantic_keywords))
 
             max_word_count = seo_guidelines.get("max_word_count")
             if max_word_count:
-                optimized["word_count"] = min(optimized.get("word_count", max_word_count), max_word_count)
+                draft["word_count"] = min(draft.get("word_count", max_word_count), max_word_count)
 
-        optimized["seo_optimized"] = True
-        optimized["seo_applied_at"] = datetime.now().isoformat()
+        draft["seo_optimized"] = True
+        draft["seo_applied_at"] = now_iso()
 
-        return optimized
\ No newline at end of file
+        return draft
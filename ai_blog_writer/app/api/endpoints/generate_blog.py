@@ -1,6 +1,7 @@
 # ai_blog_writer\app\api\endpoints\generate_blog.py
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Awaitable, Dict, Any
 from datetime import datetime
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -86,6 +87,15 @@ async def _run_content_pipeline_with_callback(
         # Error status is already updated by the pipeline itself
 
 
+async def _await_then_run(insert_task: Awaitable, task_id: str, **pipeline_kwargs):
+    """Let the pending-row insert land before the pipeline starts touching the task."""
+    try:
+        await insert_task
+    except Exception as e:
+        logger.error(f"Pending blog_results insert failed for {task_id}: {e}")
+    await _run_content_pipeline_with_callback(task_id=task_id, **pipeline_kwargs)
+
+
 # ✅ enforce internal secret check
 @router.post("/generate", status_code=202, dependencies=[Depends(verify_internal_secret)])
 async def generate_blog(
@@ -117,7 +127,8 @@ async def generate_blog(
 
         logger.info(f"Accepted blog generation task: {task_id} for topic: {topic}")
 
-        await supabase_client.insert_into(
+        # Insert runs concurrently with the response; the background task awaits it
+        insert_task = asyncio.create_task(supabase_client.insert_into(
             "blog_results",
             {
                 "task_id": task_id,
@@ -129,10 +140,11 @@ async def generate_blog(
                 "tone": tone,
                 "created_at": datetime.now().isoformat(),
             },
-        )
+        ))
 
         background_tasks.add_task(
-            _run_content_pipeline_with_callback,
+            _await_then_run,
+            insert_task,
             task_id=task_id,
             topic=topic,
             user_id=user_id,
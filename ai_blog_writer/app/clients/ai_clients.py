@@ -1,14 +1,105 @@
 # ai_blog_writer/src/app/services/ai_clients.py
-import httpx
+import asyncio
+import functools
+import hashlib
 import json
+import logging
 import re
-from typing import Optional
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
-from ..middleware.rate_limiter import ai_rate_limit
+import msgspec
+import orjson
+
+from .http_client import http_client
+from .redis_client import redis_client
+from ..core.exceptions import IntegrationError
+from ..middleware.rate_limiter import (
+    GEMINI_CONCURRENCY,
+    GEMINI_EMBED_LIMITER,
+    GEMINI_LIMITER,
+    GEMINI_RPM,
+    ai_rate_limit,
+)
 from ..core.config import settings
 from google import genai
 from typing import Optional 
 
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL = 86400  # seconds a cached Gemini reply is served from Redis
+
+
+@functools.lru_cache(maxsize=None)
+def _json_decoder(response_type: type) -> msgspec.json.Decoder:
+    """Schema-specialized decoder, built once per response type (lax str->number coercion)."""
+    return msgspec.json.Decoder(response_type, strict=False)
+
+
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+def _extract_json(text: str) -> Any:
+    """First complete JSON object/array embedded in text (prose, ``` fences, ...)."""
+    idx = min((i for i in (text.find("{"), text.find("[")) if i != -1), default=-1)
+    while idx != -1:
+        try:
+            return _raw_decode(text, idx)[0]
+        except ValueError:
+            # A stray bracket in the prose; move on to the next candidate
+            nxt = [i for i in (text.find("{", idx + 1), text.find("[", idx + 1)) if i != -1]
+            idx = min(nxt, default=-1)
+    raise ValueError("no JSON value found")
+
+
+class _JsonStringScanner:
+    """
+    Incrementally decodes the value of one top-level string field
+    (e.g. "content": "...") of a JSON document that arrives in chunks.
+    """
+
+    def __init__(self, key: str):
+        self._start_re = re.compile(r'"%s"\s*:\s*"' % re.escape(key))
+        self._buf = ""
+        self._pos = -1  # first undecoded character of the value; -1 until found
+        self.value = ""
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Add a chunk; returns the value decoded so far."""
+        self._buf += chunk
+        if self.done:
+            return self.value
+        if self._pos < 0:
+            match = self._start_re.search(self._buf)
+            if not match:
+                return self.value
+            self._pos = match.end()
+
+        # Advance over complete characters/escapes only, stopping at the closing quote
+        buf = self._buf
+        end = self._pos
+        while end < len(buf):
+            c = buf[end]
+            if c == '"':
+                self.done = True
+                break
+            if c == "\\":
+                size = 6 if buf[end + 1:end + 2] == "u" else 2
+                if end + size > len(buf):
+                    break
+                end += size
+            else:
+                end += 1
+
+        if end > self._pos:
+            try:
+                self.value += orjson.loads(f'"{buf[self._pos:end]}"')
+                self._pos = end
+            except orjson.JSONDecodeError:
+                pass  # e.g. half of a surrogate pair; retry with the next chunk
+        return self.value
+
 
 class NanoBananaClient:
     def __init__(self, api_key: str):
@@ -34,75 +125,415 @@ class GeminiClient:
 
     def __init__(self, api_key: str):
         self.gemini_key = api_key
-        self.gemini_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+        self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self.model = "gemini-2.0-flash"
+        # Cheaper/faster tier for short classification-style subtasks
+        self.lite_model = "gemini-2.0-flash-lite"
+        self.gemini_url = f"{self.base_url}/models/{self.model}:generateContent"
+
+        # Shared pooled keep-alive/HTTP2 client (see clients/http_client.py)
+        self._http = http_client
+
+        # Redis read-through cache of generate() replies (see generate's cache_mode).
+        # Off by default: the agents keep their own in-process LLMCache layers, and
+        # this one is for sharing replies across workers or replaying recorded runs.
+        self.response_cache_mode = settings.gemini_cache_mode
+
+        # (model, cache_key) -> (cached content name or None on failure, expires_at)
+        self._cached_contents: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
 
         if not self.gemini_key:
             raise RuntimeError("GEMINI_API_KEY must be set in environment")
 
-    @ai_rate_limit(provider="gemini", max_requests=60, window_seconds=60)
-    async def generate(self, prompt: str, user_id: Optional[str] = None) -> str:
+    async def get_cached_content(
+        self,
+        cache_key: str,
+        system_instruction: str,
+        ttl_seconds: int = 3600,
+        model: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Return a Gemini context-cache name holding `system_instruction`.
+
+        The cache is created on first use and recreated shortly before it
+        expires. Returns None when caching is unavailable (e.g. the prefix is
+        below the API's minimum cacheable size); callers should then send the
+        instructions inline. Failures are remembered for the TTL so they are
+        not retried on every call. Caches are per model, so pass the same
+        `model` as the generate call that will reference it.
+        """
+        model = model or self.model
+        entry = self._cached_contents.get((model, cache_key))
+        if entry and entry[1] > time.monotonic():
+            return entry[0]
+
+        name = None
+        try:
+            response = await self._http.post(
+                f"{self.base_url}/cachedContents?key={self.gemini_key}",
+                json={
+                    "model": f"models/{model}",
+                    "systemInstruction": {"parts": [{"text": system_instruction}]},
+                    "ttl": f"{ttl_seconds}s",
+                },
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            name = response.json().get("name")
+        except Exception as e:
+            logger.info(f"Gemini context cache unavailable for '{cache_key}': {e}")
+
+        # Refresh a minute early so requests never reference an expired cache
+        self._cached_contents[(model, cache_key)] = (
+            name,
+            time.monotonic() + max(ttl_seconds - 60, 0),
+        )
+        return name
+
+    async def embed(self, text: str, model: str = "text-embedding-004") -> List[float]:
+        """
+        Return the embedding vector for `text`.
+
+        Throttled by its own quota only: embeddings are short calls, so they must not
+        take the generation concurrency slots or requests-per-minute budget.
+        """
+        async with GEMINI_EMBED_LIMITER:
+            response = await self._http.post(
+                f"{self.base_url}/models/{model}:embedContent?key={self.gemini_key}",
+                json={
+                    "model": f"models/{model}",
+                    "content": {"parts": [{"text": text}]},
+                },
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            return response.json()["embedding"]["values"]
+
+    def _generation_payload(
+        self, prompt: str, cached_content: Optional[str], response_mime_type: str
+    ) -> Dict[str, Any]:
+        payload = {
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": 0.1,
+                "maxOutputTokens": 2048,
+                "responseMimeType": response_mime_type,
+            },
+        }
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        return payload
+
+    async def generate(
+        self,
+        prompt: str,
+        user_id: Optional[str] = None,
+        cached_content: Optional[str] = None,
+        response_mime_type: str = "text/plain",
+        model: Optional[str] = None,
+        cache_mode: Optional[str] = None,
+    ) -> str:
         """
         Generate text using Gemini.
         Args:
             prompt: text prompt to send
             user_id: optional user_id for Redis rate limiting
+            cached_content: optional context-cache name (see get_cached_content)
+            response_mime_type: "application/json" makes Gemini emit bare JSON
+            model: optional model override (e.g. self.lite_model); defaults to self.model
+            cache_mode: Redis response cache behaviour, "enabled" (read-through),
+                "replay" (cache only; raise on a miss) or "disabled";
+                defaults to self.response_cache_mode. The lookup happens before
+                the rate limiter, so hits spend no quota.
         Returns:
             Generated text string
         """
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                f"{self.gemini_url}?key={self.gemini_key}",
-                json={
-                    "contents": [{"parts": [{"text": prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.1,
-                        "maxOutputTokens": 2048,
-                        "responseMimeType": "text/plain",
-                    },
-                },
+        payload = self._generation_payload(prompt, cached_content, response_mime_type)
+        model = model or self.model
+        cache_mode = cache_mode or self.response_cache_mode
+
+        cache_key = None
+        if cache_mode != "disabled":
+            cache_key = self._response_cache_key(model, payload)
+            cached = await self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+            if cache_mode == "replay":
+                raise IntegrationError("No cached Gemini response (replay mode)", service_name="gemini")
+
+        text = await self._generate_uncached(model, payload, user_id=user_id)
+
+        if cache_key and text:
+            try:
+                # Wrapped in an object: RedisClient.get JSON-decodes bare JSON replies
+                await redis_client.setex(cache_key, RESPONSE_CACHE_TTL, {"text": text})
+            except Exception as e:
+                logger.debug(f"Gemini response cache write failed: {e}")
+        return text
+
+    @ai_rate_limit(provider="gemini", max_requests=GEMINI_RPM, window_seconds=60)
+    async def _generate_uncached(
+        self, model: str, payload: Dict[str, Any], user_id: Optional[str] = None
+    ) -> str:
+        """One rate-limited generateContent call; returns the first candidate's text."""
+        url = (
+            f"{self.base_url}/models/{model}:generateContent"
+            if model != self.model
+            else self.gemini_url
+        )
+        async with GEMINI_CONCURRENCY, GEMINI_LIMITER:
+            response = await self._http.post(
+                f"{url}?key={self.gemini_key}",
+                json=payload,
                 headers={"Content-Type": "application/json"},
             )
 
             response.raise_for_status()
             data = response.json()
 
-            # Parse Gemini response (robust version from onpageseo)
-            if "candidates" in data and data["candidates"]:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    text = candidate["content"]["parts"][0].get("text", "")
-                    return text
+        usage = data.get("usageMetadata", {})
+        if usage.get("cachedContentTokenCount"):
+            logger.debug(
+                f"Gemini tokens: prompt={usage.get('promptTokenCount')} "
+                f"cached={usage['cachedContentTokenCount']} "
+                f"output={usage.get('candidatesTokenCount')}"
+            )
+
+        # Parse Gemini response (robust version from onpageseo)
+        text = ""
+        if "candidates" in data and data["candidates"]:
+            candidate = data["candidates"][0]
+            if "content" in candidate and "parts" in candidate["content"]:
+                text = candidate["content"]["parts"][0].get("text", "")
+        return text
 
+    @staticmethod
+    def _response_cache_key(model: str, payload: Dict[str, Any]) -> str:
+        """Key over everything that shapes the reply: model, prompt, generation config, context cache."""
+        digest = hashlib.sha256(model.encode("utf-8"))
+        digest.update(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS))
+        return f"gemini:resp:{digest.hexdigest()}"
 
-            return ""
+    @staticmethod
+    async def _get_cached_response(cache_key: str) -> Optional[str]:
+        try:
+            cached = await redis_client.get(cache_key)
+        except Exception as e:  # Redis down: behave as a miss
+            logger.debug(f"Gemini response cache read failed: {e}")
+            return None
+        if isinstance(cached, dict) and isinstance(cached.get("text"), str):
+            return cached["text"]
+        return None
 
-    @ai_rate_limit(provider="gemini", max_requests=30, window_seconds=60)
-    async def generate_structured(
-        self, prompt: str, user_id: Optional[str] = None
-    ) -> dict:
-        """
-        Generate structured JSON output from Gemini.
-        Always returns a dict (safe for downstream usage).
-        """
-        json_prompt = f"""
+    async def generate_stream(
+        self,
+        prompt: str,
+        cached_content: Optional[str] = None,
+        response_mime_type: str = "text/plain",
+        model: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Yield text chunks as Gemini produces them (streamGenerateContent over SSE)."""
+        payload = self._generation_payload(prompt, cached_content, response_mime_type)
+        url = (
+            f"{self.base_url}/models/{model or self.model}:streamGenerateContent"
+            f"?alt=sse&key={self.gemini_key}"
+        )
+
+        async with GEMINI_CONCURRENCY, GEMINI_LIMITER:
+            async with self._http.stream(
+                "POST", url, json=payload, headers={"Content-Type": "application/json"}
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    candidates = orjson.loads(line[5:]).get("candidates") or [{}]
+                    for part in candidates[0].get("content", {}).get("parts", []):
+                        if part.get("text"):
+                            yield part["text"]
+
+    @staticmethod
+    def _json_prompt(prompt: str) -> str:
+        return f"""
         {prompt}
 
         IMPORTANT: Return ONLY valid JSON. 
         No text outside JSON. No markdown. No explanations.
         """
 
-        text = await self.generate(json_prompt, user_id=user_id)
+    @staticmethod
+    def _parse_structured(text: str, response_type: Optional[type]) -> Any:
+        if response_type is not None:
+            try:
+                return msgspec.to_builtins(_json_decoder(response_type).decode(text))
+            except (msgspec.DecodeError, msgspec.ValidationError) as e:
+                logger.debug(f"Gemini reply did not match {response_type.__name__}: {e}")
 
-        # Attempt to parse JSON from response
+        # Attempt to parse JSON from response (bare JSON is the common case)
         try:
-            json_match = re.search(r"\{.*\}|\[.*\]", text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            return json.loads(text)
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+        try:
+            return _extract_json(text)
         except Exception:
             # Fail-safe: return empty dict
             return {}
 
+    async def generate_structured(
+        self,
+        prompt: str,
+        user_id: Optional[str] = None,
+        cached_content: Optional[str] = None,
+        response_type: Optional[type] = None,
+        model: Optional[str] = None,
+        cache_mode: Optional[str] = None,
+    ) -> Any:
+        """
+        Generate structured JSON output from Gemini.
+        Always returns plain JSON data ({} on failure, safe for downstream usage).
+
+        With `response_type` (a msgspec.Struct), the reply is decoded by a
+        schema-specialized parser that fills field defaults; replies that
+        don't match the schema fall back to generic JSON parsing.
+        """
+        text = await self.generate(
+            self._json_prompt(prompt),
+            user_id=user_id,
+            cached_content=cached_content,
+            response_mime_type="application/json",
+            model=model,
+            cache_mode=cache_mode,
+        )
+        return self._parse_structured(text, response_type)
+
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        response_mime_type: str = "text/plain",
+        model: Optional[str] = None,
+        poll_interval: float = 10.0,
+        timeout: float = 900.0,
+    ) -> List[str]:
+        """
+        Run `prompts` through the Gemini Batch API (half the per-token price of
+        generateContent, one HTTP submission for all of them).
+
+        Batch jobs are queued server-side and may take minutes to complete, so
+        this is only for work that can wait. Returns one text per prompt, in
+        input order ("" for requests the job reported as failed). Raises on
+        submission errors, on a failed job, or when `timeout` elapses (the job
+        is cancelled); callers should fall back to per-request `generate`.
+        """
+        model = model or self.model
+        requests = [
+            {
+                "request": self._generation_payload(prompt, None, response_mime_type),
+                "metadata": {"key": str(i)},
+            }
+            for i, prompt in enumerate(prompts)
+        ]
+
+        async with GEMINI_CONCURRENCY, GEMINI_LIMITER:
+            response = await self._http.post(
+                f"{self.base_url}/models/{model}:batchGenerateContent?key={self.gemini_key}",
+                json={
+                    "batch": {
+                        "display_name": f"batch-{int(time.time())}",
+                        "input_config": {"requests": {"requests": requests}},
+                    }
+                },
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+        name = response.json()["name"]
+
+        deadline = time.monotonic() + timeout
+        while True:
+            response = await self._http.get(f"{self.base_url}/{name}?key={self.gemini_key}")
+            response.raise_for_status()
+            job = response.json()
+            state = job.get("metadata", {}).get("state", "")
+            if state.endswith("_SUCCEEDED"):
+                break
+            if state.endswith(("_FAILED", "_CANCELLED", "_EXPIRED")):
+                raise RuntimeError(f"Gemini batch {name} ended in state {state}")
+            if time.monotonic() > deadline:
+                try:
+                    await self._http.post(f"{self.base_url}/{name}:cancel?key={self.gemini_key}")
+                except Exception as e:
+                    logger.debug(f"Cancelling Gemini batch {name} failed: {e}")
+                raise TimeoutError(f"Gemini batch {name} not done after {timeout:.0f}s")
+            await asyncio.sleep(poll_interval)
+
+        inlined = job.get("response", {}).get("inlinedResponses", [])
+        if isinstance(inlined, dict):
+            inlined = inlined.get("inlinedResponses", [])
+
+        texts = [""] * len(prompts)
+        for position, item in enumerate(inlined):
+            key = item.get("metadata", {}).get("key")
+            index = int(key) if key is not None else position
+            if item.get("error") or not 0 <= index < len(texts):
+                logger.warning(f"Gemini batch request {index} failed: {item.get('error')}")
+                continue
+            candidates = item.get("response", {}).get("candidates") or [{}]
+            parts = candidates[0].get("content", {}).get("parts", [])
+            texts[index] = "".join(part.get("text", "") for part in parts)
+        return texts
+
+    async def generate_structured_batch(
+        self,
+        prompts: List[str],
+        response_type: Optional[type] = None,
+        model: Optional[str] = None,
+        timeout: float = 900.0,
+    ) -> List[Any]:
+        """generate_structured for many prompts via generate_batch ({} per failed item)."""
+        texts = await self.generate_batch(
+            [self._json_prompt(prompt) for prompt in prompts],
+            response_mime_type="application/json",
+            model=model,
+            timeout=timeout,
+        )
+        return [self._parse_structured(text, response_type) if text else {} for text in texts]
+
+    @ai_rate_limit(provider="gemini", max_requests=GEMINI_RPM, window_seconds=60)
+    async def generate_structured_watched(
+        self,
+        prompt: str,
+        field: str,
+        on_progress: Callable[[str], bool],
+        user_id: Optional[str] = None,
+        cached_content: Optional[str] = None,
+        response_type: Optional[type] = None,
+        model: Optional[str] = None,
+    ) -> Any:
+        """
+        Like generate_structured, but streams the reply and calls `on_progress`
+        with the top-level string `field` decoded so far. If `on_progress`
+        returns False the stream is closed (so Gemini stops generating) and
+        `{field: <partial value>, "truncated": True}` is returned.
+        """
+        scanner = _JsonStringScanner(field)
+        chunks = []
+        stream = self.generate_stream(
+            self._json_prompt(prompt),
+            cached_content=cached_content,
+            response_mime_type="application/json",
+            model=model,
+        )
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                value = scanner.feed(chunk)
+                if value and not scanner.done and not on_progress(value):
+                    return {field: value, "truncated": True}
+        finally:
+            await stream.aclose()
+
+        return self._parse_structured("".join(chunks), response_type)
+
 
 # Instantiate a single global Gemini client
 gemini_client = GeminiClient(api_key=settings.gemini_api_key)
@@ -1,26 +1,26 @@
 # ai-worker/app/services/serpapi.py
 from __future__ import annotations
 from typing import Dict, Any, Optional, List
+import hashlib
 import httpx
 import logging
 
+from .http_client import http_client
+from .redis_client import redis_client
 from ..core.config import settings  # where your SERPAPI_KEY should live
 
 logger = logging.getLogger(__name__)
 
-# Shared HTTP client (singleton)
-_http_client: Optional[httpx.AsyncClient] = None
 _BASE_URL = "https://serpapi.com/search.json"
+RELATED_KEYWORDS_TTL = 21600  # 6h; related keywords drift slowly and each lookup costs quota
 
 
 class SerpApiClient:
     """Async client for interacting with SerpAPI."""
 
     def __init__(self, api_key: str):
-        global _http_client
-        if _http_client is None:
-            _http_client = httpx.AsyncClient(timeout=30.0)
-        self._client = _http_client
+        # Shared pooled keep-alive/HTTP2 client (closed on app shutdown)
+        self._client = http_client
         self.api_key = api_key
 
     async def _request(self, params: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,14 +45,18 @@ class SerpApiClient:
         params = {"q": query, "location": location, "gl": gl, "hl": hl}
         return await self._request(params)
 
-    async def get_related_keywords(self, keyword: str) -> Dict[str, Any]:
-        """Get related keyword suggestions via SerpAPI."""
-        params = {"q": keyword, "type": "related_keywords"}
-        return await self._request(params)
+    async def get_related_keywords(self, keyword: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """Get related keyword suggestions via SerpAPI (cached in Redis)."""
+        key = "serp:rk:" + hashlib.sha256(keyword.strip().lower().encode()).hexdigest()
+        if not force_refresh:
+            cached = await redis_client.get(key)
+            if isinstance(cached, dict):
+                return cached
 
-    async def close(self):
-        """Close shared HTTP client."""
-        await self._client.aclose()
+        params = {"q": keyword, "type": "related_keywords"}
+        result = await self._request(params)
+        await redis_client.setex(key, RELATED_KEYWORDS_TTL, result)
+        return result
 
 
 # ✅ Module-level singleton (like supabase_client)
@@ -1,7 +1,20 @@
 import cloudinary
+import cloudinary.api
 import cloudinary.uploader
+from cloudinary.exceptions import NotFound
 import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+from .http_client import http_client
 from ..core.config import settings
+from ..middleware.rate_limiter import CLOUDINARY_LIMITER
+
+logger = logging.getLogger(__name__)
 
 cloudinary.config(
     cloud_name=settings.cloudinary_cloud_name,
@@ -10,11 +23,90 @@ cloudinary.config(
 )
 
 
-async def upload_image(file_path: str, folder: str = "articles") -> str:
-    """Upload an image to Cloudinary and return the secure URL."""
-    result = await asyncio.to_thread(
-        cloudinary.uploader.upload, file_path, folder=folder
-    )
+UPLOAD_URL = f"https://api.cloudinary.com/v1_1/{settings.cloudinary_cloud_name}/image/upload"
+# Larger files go up in chunks of this size (Cloudinary's minimum chunk is 5MB)
+UPLOAD_CHUNK_SIZE = 6_000_000
+
+
+def _sign(params: dict) -> str:
+    """Cloudinary request signature: SHA-1 of the sorted params followed by the API secret."""
+    to_sign = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return hashlib.sha1(f"{to_sign}{settings.cloudinary_api_secret}".encode()).hexdigest()
+
+
+async def upload_image(
+    file: Union[str, bytes],
+    public_id: Optional[str] = None,
+    folder: str = "articles",
+) -> str:
+    """Upload an image (path or raw bytes) to Cloudinary and return the secure URL."""
+    # Posted straight through the shared pooled client: no SDK thread hop, no new TLS per upload
+    if isinstance(file, str):
+        size = await asyncio.to_thread(os.path.getsize, file)
+    else:
+        size = len(file)
+    params = {"folder": folder, "timestamp": int(time.time())}
+    if public_id:
+        params.update(public_id=public_id, overwrite="false")
+    data = {**params, "api_key": settings.cloudinary_api_key, "signature": _sign(params)}
+    # Upload API calls don't count against the Admin API quota CLOUDINARY_LIMITER guards
+    if size > UPLOAD_CHUNK_SIZE:
+        response = await _upload_chunked(file, size, data)
+    else:
+        if isinstance(file, str):
+            file = await asyncio.to_thread(Path(file).read_bytes)
+        response = await http_client.post(
+            UPLOAD_URL, data=data, files={"file": ("upload", file)}
+        )
+        response.raise_for_status()
+    return response.json()["secure_url"]
+
+
+def _read_range(path: str, offset: int, size: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read(size)
+
+
+async def _upload_chunked(file: Union[str, bytes], size: int, data: dict):
+    """Cloudinary chunked upload: same signed params per chunk, tied by X-Unique-Upload-Id.
+
+    Only one chunk is held in memory at a time for path uploads; the response to the
+    last chunk carries the finished resource.
+    """
+    upload_id = uuid.uuid4().hex
+    response = None
+    for start in range(0, size, UPLOAD_CHUNK_SIZE):
+        if isinstance(file, str):
+            chunk = await asyncio.to_thread(_read_range, file, start, UPLOAD_CHUNK_SIZE)
+        else:
+            chunk = file[start:start + UPLOAD_CHUNK_SIZE]
+        response = await http_client.post(
+            UPLOAD_URL,
+            data=data,
+            files={"file": ("upload", chunk)},
+            headers={
+                "X-Unique-Upload-Id": upload_id,
+                "Content-Range": f"bytes {start}-{start + len(chunk) - 1}/{size}",
+            },
+        )
+        response.raise_for_status()
+    return response
+
+
+async def find_image(public_id: str, folder: str = "articles") -> Optional[str]:
+    """Return the secure URL of an already uploaded image, or None if it doesn't exist.
+
+    Any Admin API failure (rate limit, outage) counts as a miss so callers regenerate.
+    """
+    try:
+        async with CLOUDINARY_LIMITER:
+            result = await asyncio.to_thread(cloudinary.api.resource, f"{folder}/{public_id}")
+    except NotFound:
+        return None
+    except Exception as e:
+        logger.warning(f"Cloudinary lookup failed for {folder}/{public_id}: {e}")
+        return None
     return result["secure_url"]
 
 
@@ -0,0 +1,22 @@
+# ai_blog_writer/app/clients/http_client.py
+import httpx
+
+# One pooled keep-alive/HTTP2 client for every outbound API call (Gemini, SerpAPI,
+# Google Custom Search, YouTube, Trends). httpx pools connections per host, so each
+# API still gets its own multiplexed connections; the app manages one lifecycle.
+http_client = httpx.AsyncClient(
+    # Fail fast on an unreachable host; keep 30s for slow generations
+    timeout=httpx.Timeout(30.0, connect=5.0),
+    # Pool settings live on the transport once one is passed. retries only re-attempts
+    # failed connects (nothing was sent yet), so it is safe for POSTs too.
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100, keepalive_expiry=60.0),
+        retries=2,
+    ),
+)
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client (called on app shutdown)."""
+    await http_client.aclose()
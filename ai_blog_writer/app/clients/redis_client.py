@@ -1,8 +1,8 @@
 # ai_blog_writer/src/clients/redis_client.py
 import asyncio
-import json
 import logging
 from typing import Optional, Any, Union
+import orjson
 from upstash_redis.asyncio import Redis
 from ..core.config import settings
 
@@ -13,8 +13,8 @@ class RedisClient:
     Async Redis client using Upstash Redis for AI Blog Writer.
     Features:
       - Atomic increment + expiry
-      - Concurrency-safe connection
-      - Automatic reconnection
+      - Concurrency-safe connection, opened once from the app lifespan
+      - Fail-fast ops: before connect() every call errors and returns its fallback
     """
     def __init__(self):
         self._client: Optional[Redis] = None
@@ -29,6 +29,8 @@ class RedisClient:
             if self._is_connected:
                 return
             try:
+                # Upstash speaks stateless REST: the client stays usable even if this
+                # first ping fails, so later calls recover once Redis is reachable
                 self._client = Redis(
                     url=settings.redis_url,
                     token=settings.redis_token
@@ -49,10 +51,8 @@ class RedisClient:
 
     async def set_once(self, key: str, value: Union[str, dict], ttl: int = 86400) -> bool:
         """Set key only if it does not exist (NX flag)."""
-        if not self._is_connected:
-            await self.connect()
         if isinstance(value, dict):
-            value = json.dumps(value)
+            value = orjson.dumps(value).decode()
         try:
             return await self._client.set(name=key, value=value, ex=ttl, nx=True)
         except Exception as e:
@@ -61,10 +61,8 @@ class RedisClient:
 
     async def setex(self, key: str, ttl: int, value: Union[str, dict]) -> bool:
         """Set key with expiry (overwrite if exists)."""
-        if not self._is_connected:
-            await self.connect()
         if isinstance(value, dict):
-            value = json.dumps(value)
+            value = orjson.dumps(value).decode()
         try:
             return await self._client.setex(key, ttl, value)
         except Exception as e:
@@ -73,23 +71,19 @@ class RedisClient:
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value and attempt JSON decoding."""
-        if not self._is_connected:
-            await self.connect()
         try:
             value = await self._client.get(key)
             if value is None:
                 return None
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
                 return value
         except Exception as e:
             logger.error(f"Redis get failed for key {key}: {e}")
             return None
 
     async def delete(self, key: str) -> bool:
-        if not self._is_connected:
-            await self.connect()
         try:
             result = await self._client.delete(key)
             return result > 0
@@ -98,8 +92,6 @@ class RedisClient:
             return False
 
     async def exists(self, key: str) -> bool:
-        if not self._is_connected:
-            await self.connect()
         try:
             return await self._client.exists(key) > 0
         except Exception as e:
@@ -111,13 +103,12 @@ class RedisClient:
         Atomically increment a key and set expiry.
         Compatible with rate limiter and counters.
         """
-        if not self._is_connected:
-            await self.connect()
         try:
-            count = await self._client.incr(key)
-            current_ttl = await self._client.ttl(key)
-            if current_ttl <= 0:
-                await self._client.expire(key, ttl)
+            # One MULTI/EXEC round trip; EXPIRE NX only sets the TTL on the first hit
+            tx = self._client.multi()
+            tx.incr(key)
+            tx.expire(key, ttl, nx=True)
+            count, _ = await tx.exec()
             return count
         except Exception as e:
             logger.error(f"Redis increment_with_expiry failed for key {key}: {e}")
@@ -125,8 +116,6 @@ class RedisClient:
 
     async def get_health(self) -> bool:
         """Ping Redis to check health."""
-        if not self._is_connected:
-            await self.connect()
         try:
             return await self._client.ping() == "PONG"
         except Exception:
@@ -134,8 +123,6 @@ class RedisClient:
 
     async def get_ttl(self, key: str) -> int:
         """Return TTL of a key in seconds, -2 if key does not exist, -1 if no expiry."""
-        if not self._is_connected:
-            await self.connect()
         try:
             ttl = await self._client.ttl(key)
             return ttl
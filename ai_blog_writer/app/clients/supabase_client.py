@@ -2,40 +2,109 @@
 # Please use async supabase supported by supabase-py-async
 
 # ai_blog_writer/app/services/supabase_client.py
-import asyncio
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-import concurrent.futures
+from typing import Any, Dict, List, Optional, Tuple
 
-from supabase import create_client, Client
+import orjson
+from postgrest import DEFAULT_POSTGREST_CLIENT_HEADERS, AsyncPostgrestClient
 from ..core.config import settings
 
-_executor = concurrent.futures.ThreadPoolExecutor(max_workers=10)
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+
+# -------------------------
+# Direct Postgres (asyncpg) helpers
+# -------------------------
+# Rows travel as jsonb and are cast by Postgres through the table's own row type
+# (jsonb_populate_record[set]), so ISO strings, UUIDs and JSON columns convert
+# exactly as they do through PostgREST, and to_jsonb() gives back the same shapes.
+def _ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def _init_pg_connection(conn) -> None:
+    for json_type in ("json", "jsonb"):
+        await conn.set_type_codec(
+            json_type,
+            encoder=lambda value: orjson.dumps(value).decode(),
+            decoder=orjson.loads,
+            schema="pg_catalog",
+        )
+
+
+# Range operators accepted in filter dicts ({"col": {"gte": a, "lt": b}})
+_SQL_OPS = {"eq": "=", "gte": ">=", "lte": "<=", "lt": "<"}
+
+
+def _filter_triples(filters: Optional[Dict[str, Any]]) -> List[Tuple[str, str, Any]]:
+    """Flatten a filter dict into (op, column, value) triples in one pass."""
+    triples = []
+    for col, val in (filters or {}).items():
+        if isinstance(val, dict):
+            for op, v in val.items():
+                if op not in _SQL_OPS:
+                    raise ValueError(f"Unsupported filter operator {op!r} for column {col!r}")
+                triples.append((op, col, v))
+        else:
+            triples.append(("eq", col, val))
+    return triples
+
+
+def _split_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """{"col": v, "col2": {"gte": a, "lte": b, "lt": c}} -> one row per operator."""
+    ops: Dict[str, Dict[str, Any]] = {"=": {}, ">=": {}, "<=": {}, "<": {}}
+    for op, col, val in _filter_triples(filters):
+        ops[_SQL_OPS[op]][col] = val
+    return {op: row for op, row in ops.items() if row}
+
+
+def _where_clause(table: str, filters: Optional[Dict[str, Any]], first_param: int = 1):
+    """FROM items, WHERE conditions and params for the filter rows."""
+    sources, conditions, params = [], [], []
+    for i, (op, row) in enumerate(_split_filters(filters).items()):
+        alias = f"f{i}"
+        params.append(row)
+        sources.append(f"jsonb_populate_record(NULL::{table}, ${first_param + i}::jsonb) AS {alias}")
+        conditions.extend(f"{table}.{_ident(col)} {op} {alias}.{_ident(col)}" for col in row)
+    return sources, conditions, params
+
+
 # -------------------------
 # Async Query Wrapper
 # -------------------------
 class AsyncQueryBuilder:
-    def __init__(self, sync_query_builder):
-        self._sync_query_builder = sync_query_builder
+    def __init__(self, query_builder):
+        self._query_builder = query_builder
 
     def select(self, columns: str = "*") -> "AsyncQueryBuilder":
-        self._sync_query_builder = self._sync_query_builder.select(columns)
+        self._query_builder = self._query_builder.select(columns)
         return self
 
     def eq(self, column: str, value: Any) -> "AsyncQueryBuilder":
-        self._sync_query_builder = self._sync_query_builder.filter(column, "eq", value)
+        self._query_builder = self._query_builder.filter(column, "eq", value)
         return self
 
     def in_(self, column: str, values: List[Any]) -> "AsyncQueryBuilder":
-        self._sync_query_builder = self._sync_query_builder.filter(column, "in", values)
+        self._query_builder = self._query_builder.filter(column, "in", values)
         return self
 
     def gte(self, column: str, value: Any) -> "AsyncQueryBuilder":
-        self._sync_query_builder = self._sync_query_builder.filter(column, "gte", value)
+        self._query_builder = self._query_builder.filter(column, "gte", value)
         return self
 
     def lte(self, column: str, value: Any) -> "AsyncQueryBuilder":
-        self._sync_query_builder = self._sync_query_builder.filter(column, "lte", value)
+        self._query_builder = self._query_builder.filter(column, "lte", value)
+        return self
+
+    def lt(self, column: str, value: Any) -> "AsyncQueryBuilder":
+        self._query_builder = self._query_builder.filter(column, "lt", value)
+        return self
+
+    def limit(self, count: int) -> "AsyncQueryBuilder":
+        self._query_builder = self._query_builder.limit(count)
         return self
 
     def delete(self) -> "AsyncQueryBuilder":
@@ -50,91 +119,173 @@ class AsyncQueryBuilder:
         raise NotImplementedError("Use supabase_client.insert_into() instead.")
 
     async def execute(self) -> Any:
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(_executor, self._sync_query_builder.execute)
+        return await self._query_builder.execute()
 # -------------------------
 # Async Supabase Client
 # -------------------------
 class AsyncSupabaseClient:
     def __init__(self):
-        self._client: Optional[Client] = None
+        self._client: Optional[AsyncPostgrestClient] = None
         self._is_connected = False
+        # asyncpg pool for the hot-path reads/writes; REST client stays the fallback
+        self._pool = None
 
     def connect(self):
-        """Sync connection (Supabase client is synchronous)."""
-        self._client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+        """Build the async PostgREST client (its httpx session connects lazily)."""
+        key = settings.supabase_service_role_key
+        self._client = AsyncPostgrestClient(
+            f"{settings.supabase_url}/rest/v1",
+            headers={
+                **DEFAULT_POSTGREST_CLIENT_HEADERS,
+                "apikey": key,
+                "Authorization": f"Bearer {key}",
+            },
+        )
         self._is_connected = True
         print("✅ Supabase connected.")
 
+    async def connect_pool(self):
+        """Open the direct Postgres pool when SUPABASE_DB_URL is configured."""
+        if self._pool is not None or not settings.supabase_db_url:
+            return
+        if asyncpg is None:
+            print("⚠️ SUPABASE_DB_URL set but asyncpg is not installed — using REST")
+            return
+        self._pool = await asyncpg.create_pool(
+            dsn=settings.supabase_db_url,
+            min_size=2,
+            max_size=10,
+            init=_init_pg_connection,
+        )
+        print("✅ Supabase Postgres pool ready.")
+
+    async def close(self):
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await pool.close()
+        if self._client is not None:
+            client, self._client = self._client, None
+            self._is_connected = False
+            await client.aclose()
+
+    async def _pg_select(self, table_name: str, filters: Optional[Dict[str, Any]], select: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        table = _ident(table_name)
+        sources, conditions, params = _where_clause(table, filters)
+        if select.strip() == "*":
+            columns = f"to_jsonb({table}.*)"
+        else:
+            pairs = ", ".join(
+                "'" + col.replace("'", "''") + f"', {table}.{_ident(col)}"
+                for col in (c.strip() for c in select.split(","))
+            )
+            columns = f"jsonb_build_object({pairs})"
+        query = f"SELECT {columns} FROM {table}"
+        if sources:
+            query += ", " + ", ".join(sources)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if limit:
+            query += f" LIMIT {limit}"
+        async with self._pool.acquire() as conn:
+            return [record[0] for record in await conn.fetch(query, *params)]
+
     async def from_table(self, table_name: str) -> AsyncQueryBuilder:
             if not self._is_connected:
                 self.connect()
             return AsyncQueryBuilder(self._client.table(table_name))
 
-    async def fetch_one(self, table_name: str, filters: Optional[Dict[str, Any]] = None, select: str = "*") -> Optional[Dict[str, Any]]:
+    async def _filtered_select(self, table_name: str, filters: Optional[Dict[str, Any]], select: str) -> AsyncQueryBuilder:
         qb = await self.from_table(table_name)
         qb = qb.select(select)
-        if filters:
-            for col, val in filters.items():
-                if isinstance(val, dict):
-                    if "gte" in val:
-                        qb = qb.gte(col, val["gte"])
-                    if "lte" in val:
-                        qb = qb.lte(col, val["lte"])
-                else:
-                    qb = qb.eq(col, val)
-        res = await qb.execute()
+        for op, col, val in _filter_triples(filters):
+            qb = getattr(qb, op)(col, val)
+        return qb
+
+    async def fetch_one(self, table_name: str, filters: Optional[Dict[str, Any]] = None, select: str = "*") -> Optional[Dict[str, Any]]:
+        if self._pool is not None:
+            rows = await self._pg_select(table_name, filters, select, limit=1)
+            return rows[0] if rows else None
+        qb = await self._filtered_select(table_name, filters, select)
+        res = await qb.limit(1).execute()
         return res.data[0] if res.data else None
 
     async def fetch_all(self, table_name: str, filters: Optional[Dict[str, Any]] = None, select: str = "*") -> List[Dict[str, Any]]:
-        qb = await self.from_table(table_name)
-        qb = qb.select(select)
-        if filters:
-            for col, val in filters.items():
-                if isinstance(val, dict):
-                    if "gte" in val:
-                        qb = qb.gte(col, val["gte"])
-                    if "lte" in val:
-                        qb = qb.lte(col, val["lte"])
-                else:
-                    qb = qb.eq(col, val)
+        if self._pool is not None:
+            return await self._pg_select(table_name, filters, select)
+        qb = await self._filtered_select(table_name, filters, select)
         res = await qb.execute()
         return res.data or []
 
     async def insert_into(self, table_name: str, data: Dict[str, Any] | List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self._pool is not None:
+            rows = data if isinstance(data, list) else [data]
+            if not rows:
+                return []
+            # Only the supplied columns are listed, so omitted ones keep their defaults;
+            # a list of rows goes in as one statement
+            columns = ", ".join(_ident(col) for col in dict.fromkeys(k for row in rows for k in row))
+            table = _ident(table_name)
+            query = (
+                f"INSERT INTO {table} ({columns}) "
+                f"SELECT {columns} FROM jsonb_populate_recordset(NULL::{table}, $1::jsonb) "
+                f"RETURNING to_jsonb({table}.*)"
+            )
+            async with self._pool.acquire() as conn:
+                return [record[0] for record in await conn.fetch(query, rows)]
         if not self._is_connected:
             self.connect()
-        builder = self._client.table(table_name).insert(data)
-        loop = asyncio.get_running_loop()
-        res = await loop.run_in_executor(_executor, builder.execute)
+        res = await self._client.table(table_name).insert(data).execute()
         return res.data or []
 
     async def update_table(self, table_name: str, filters: Dict[str, Any], updates: Dict[str, Any]) -> List[Dict[str, Any]]:
+        # Never rewrite a whole table because the filters came out empty
+        triples = _filter_triples(filters)
+        if not triples:
+            raise ValueError(f"Refusing to update {table_name} without filters")
+        if self._pool is not None and updates:
+            table = _ident(table_name)
+            assignments = ", ".join(f"{_ident(col)} = u.{_ident(col)}" for col in updates)
+            sources, conditions, params = _where_clause(table, filters, first_param=2)
+            query = (
+                f"UPDATE {table} SET {assignments} "
+                f"FROM jsonb_populate_record(NULL::{table}, $1::jsonb) AS u, "
+                + ", ".join(sources)
+                + " WHERE " + " AND ".join(conditions)
+                + f" RETURNING to_jsonb({table}.*)"
+            )
+            async with self._pool.acquire() as conn:
+                return [record[0] for record in await conn.fetch(query, updates, *params)]
         if not self._is_connected:
             self.connect()
         builder = self._client.table(table_name).update(updates)
-        for col, val in filters.items():
-            builder = builder.filter(col, "eq", val)
-        loop = asyncio.get_running_loop()
-        res = await loop.run_in_executor(_executor, builder.execute)
+        for op, col, val in triples:
+            builder = builder.filter(col, op, val)
+        res = await builder.execute()
         return res.data or []
 
     async def get_recent_audits(
         self, website_url: str, before_timestamp: datetime
     ) -> List[Dict[str, Any]]:
-        qb = await self.from_table("seo_audit_results")
-        qb = qb.select("*").eq("website_url", website_url)
-        res = await qb.execute()
-        return [row for row in (res.data or []) if row["created_at"] < before_timestamp]
+        return await self.fetch_all(
+            "seo_audit_results",
+            filters={
+                "website_url": website_url,
+                "created_at": {"lt": before_timestamp.isoformat()},
+            },
+        )
 
     async def get_historical_metrics(
         self, website_url: str, days: int = 30
     ) -> List[Dict[str, Any]]:
         cutoff_date = datetime.utcnow() - timedelta(days=days)
-        qb = await self.from_table("seo_metrics")
-        qb = qb.select("*").eq("website_url", website_url)
-        res = await qb.execute()
-        return [row for row in (res.data or []) if row["created_at"] >= cutoff_date]
+        # Wants an index on seo_metrics (website_url, created_at DESC)
+        return await self.fetch_all(
+            "seo_metrics",
+            filters={
+                "website_url": website_url,
+                "created_at": {"gte": cutoff_date.isoformat()},
+            },
+        )
 
 # -------------------------
 # Global client instance
@@ -0,0 +1,17 @@
+# ai_blog_writer/app/core/clock.py
+import time
+from datetime import datetime
+
+# (epoch second, its local ISO-8601 string); stamps only need second resolution
+_cached_second = -1
+_cached_iso = ""
+
+
+def now_iso() -> str:
+    """Local time as ISO-8601, formatted at most once per second."""
+    global _cached_second, _cached_iso
+    second = int(time.time())
+    if second != _cached_second:
+        _cached_iso = datetime.fromtimestamp(second).isoformat()
+        _cached_second = second
+    return _cached_iso
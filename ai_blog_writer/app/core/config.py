@@ -1,24 +1,16 @@
 # ai_blog_writer/app/core/config.py
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 from typing import Optional, List
 from pathlib import Path
 from dotenv import load_dotenv
-import os 
 
 # --- Path to .env file (ai_blog_writer root) ---
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 ENV_PATH = BASE_DIR / ".env"
 
-print(f"🔍 Looking for .env at: {ENV_PATH}")
-print(f"🔍 File exists: {ENV_PATH.exists()}")
-
-if ENV_PATH.exists():
-    print("✅ Using .env file for configuration")
-else:
-    print("⚠️  .env file not found. Using system environment variables.")
-
 class Settings(BaseSettings):
     # App
     host: str = Field("0.0.0.0", validation_alias="HOST")
@@ -33,12 +25,20 @@ class Settings(BaseSettings):
     supabase_url: Optional[str] = Field(None, validation_alias="SUPABASE_URL")
     supabase_anon_key: Optional[str] = Field(None, validation_alias="SUPABASE_ANON_KEY")
     supabase_service_role_key: Optional[str] = Field(None, validation_alias="SUPABASE_SERVICE_ROLE_KEY")
+    # Direct Postgres DSN; when set, hot-path queries use an asyncpg pool instead of REST
+    supabase_db_url: Optional[str] = Field(None, validation_alias="SUPABASE_DB_URL")
 
     # AI
     gemini_api_key: Optional[str] = Field(None, validation_alias="GEMINI_API_KEY")
     gemini_nano_api_key: Optional[str] = Field(None, validation_alias="GEMINI_NANO_API_KEY")
     serpapi_key: Optional[str] = Field(None, validation_alias="SERPAPI_KEY")
     youtube_api_key: Optional[str] = Field(None, validation_alias="YOUTUBE_API_KEY")
+    # Draft blog sections through the Gemini Batch API (cheaper, but queued)
+    gemini_batch_sections: bool = Field(False, validation_alias="GEMINI_BATCH_SECTIONS")
+    gemini_batch_timeout: int = Field(900, validation_alias="GEMINI_BATCH_TIMEOUT")
+    # Redis cache of Gemini replies: "enabled", "replay" (cache only) or "disabled".
+    # Agents cache in-process already; enable to share replies across workers.
+    gemini_cache_mode: str = Field("disabled", validation_alias="GEMINI_CACHE_MODE")
 
     # Redis
     redis_url: Optional[str] = Field(None, validation_alias="UPSTASH_REDIS_REST_URL")
@@ -61,18 +61,20 @@ class Settings(BaseSettings):
         extra="ignore"
     )
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return settings instance with dotenv support."""
-    if ENV_PATH.exists():
-        load_dotenv(ENV_PATH)
-        print("✅ Manually loaded .env file with dotenv")
+    """Return settings instance with dotenv support (parsed once per process)."""
+    env_loaded = ENV_PATH.exists() and load_dotenv(ENV_PATH)
 
     settings = Settings()
 
     # Debug
-    print(f"🛠️  Loaded GEMINI_API_KEY: '{settings.gemini_api_key}'")
-    print(f"🛠️  Loaded SUPABASE_URL: '{settings.supabase_url}'")
-    print(f"🛠️  OS GEMINI_API_KEY: '{os.getenv('GEMINI_API_KEY')}'")
+    if settings.debug:
+        if env_loaded:
+            print(f"✅ Loaded .env file from {ENV_PATH}")
+        else:
+            print("⚠️  .env file not found. Using system environment variables.")
+        print(f"🛠️  Loaded SUPABASE_URL: '{settings.supabase_url}'")
 
     return settings
 
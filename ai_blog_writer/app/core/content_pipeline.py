@@ -2,9 +2,10 @@
 import asyncio
 import logging
 import uuid
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
 import inspect
+import time
 
 from ..agents.topic_agent import TopicAgent
 from ..agents.strategy_agent import StrategyAgent
@@ -13,6 +14,7 @@ from ..agents.review_agent import ReviewAgent
 from ..agents.media_agent import MediaAgent
 from ..agents.faq_agent import FAQAgent
 from ..clients.supabase_client import supabase_client
+from .clock import now_iso
 from shared_models.models import UserSettings
 
 logger = logging.getLogger(__name__)
@@ -51,7 +53,7 @@ class ContentPipeline:
         print(
             f"\n🚀 [Pipeline] Starting blog pipeline | task_id={task_id} user_id={user_id}"
         )
-        pipeline_start = datetime.now()
+        pipeline_start = time.perf_counter()
 
         # 1. Fetch user settings
         user_settings_db = await supabase_client.fetch_one(
@@ -130,34 +132,39 @@ class ContentPipeline:
             if not blog_draft or not blog_draft.get("content"):
                 raise ValueError("Blog writing failed")
 
-            # 4a. FAQs
-            print("❓ Generating FAQs...")
-            faqs = await self._run_with_retry(
-                self.faq_agent.generate_faqs,
-                blog_content=blog_draft["content"],
-                target_keywords=content_strategy.get("semantic_keywords", []),
-                language=language,
-                task_id=task_id,
-            )
-            print(f"✅ FAQs generated: {len(faqs)}")
-
-            # 5. Media
+            # 4a/5. FAQs and media only depend on the draft, so run them side by side
             headings = [
                 sec.get("heading")
                 for sec in blog_draft.get("sections", [])
                 if sec.get("heading")
             ]
-            print(f"🖼 Generating media assets for {len(headings)} headings...")
-            media_assets = await self._run_with_retry(
-                self.media_agent.generate_media_assets,
-                headings=headings,
-                title=blog_draft["title"],
-                target_keyword=content_strategy["target_keyword"],
-                website_url=website_url,
-                user_prefs=user_prefs,  # ✅ Use the validated user_prefs here
-                language=language,
-                task_id=task_id,
-            )
+            print(f"❓🖼 Generating FAQs and media assets for {len(headings)} headings...")
+            async with asyncio.TaskGroup() as tg:
+                faqs_task = tg.create_task(
+                    self._run_with_retry(
+                        self.faq_agent.generate_faqs,
+                        blog_content=blog_draft["content"],
+                        target_keywords=content_strategy.get("semantic_keywords", []),
+                        language=language,
+                        scope=user_id,
+                        task_id=task_id,
+                    )
+                )
+                media_task = tg.create_task(
+                    self._run_with_retry(
+                        self.media_agent.generate_media_assets,
+                        headings=headings,
+                        title=blog_draft["title"],
+                        target_keyword=content_strategy["target_keyword"],
+                        website_url=website_url,
+                        user_prefs=user_prefs,  # ✅ Use the validated user_prefs here
+                        language=language,
+                        task_id=task_id,
+                    )
+                )
+            faqs = faqs_task.result()
+            media_assets = media_task.result()
+            print(f"✅ FAQs generated: {len(faqs)}")
             print(f"✅ Media assets generated: {len(media_assets)}")
 
             # 6. Review
@@ -170,12 +177,11 @@ class ContentPipeline:
             )
 
             print(
-                f"✅ Review completed | Score={review_results.get('overall_score', 0)}"
+                f"✅ Review completed | Score={review_results.overall_score}"
             )
 
             # 7. Compile results
-            pipeline_end = datetime.now()
-            execution_time = (pipeline_end - pipeline_start).total_seconds()
+            execution_time = time.perf_counter() - pipeline_start
             print(f"📦 Compiling final result (took {execution_time:.2f}s)")
 
             final_result = {
@@ -187,14 +193,14 @@ class ContentPipeline:
                 "title": blog_draft["title"],
                 "meta_description": blog_draft.get("meta_description", ""),
                 "media_assets": media_assets,
-                "quality_score": review_results.get("overall_score", 0),
+                "quality_score": review_results.overall_score,
                 "topics": [topic],
                 "content_strategy": content_strategy,
                 "faqs": faqs,
                 "execution_time": execution_time,
                 "language": language,
                 "tone": tone,
-                "created_at": datetime.now().isoformat(),
+                "created_at": now_iso(),
                 "status": "completed",
             }
 
@@ -206,11 +212,23 @@ class ContentPipeline:
             return final_result
 
         except Exception as e:
-            pipeline_end = datetime.now()
-            execution_time = (pipeline_end - pipeline_start).total_seconds()
+            execution_time = time.perf_counter() - pipeline_start
             print(f"❌ Pipeline failed after {execution_time:.2f}s: {str(e)}")
             raise
 
+    async def execute_blog_creation_batch(
+        self, jobs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several blog pipelines concurrently.
+        Each job holds the keyword arguments of execute_blog_creation. Provider
+        throttling is handled by the shared limiters, so the blogs overlap their
+        I/O up to each provider's quota. Failures propagate as an ExceptionGroup.
+        """
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self.execute_blog_creation(**job)) for job in jobs]
+        return [task.result() for task in tasks]
+
     async def _run_with_retry(self, agent_method, **kwargs):
         """
         Run an agent method with retry logic, backoff, and attempt logging.
@@ -0,0 +1,124 @@
+# ai_blog_writer/app/core/llm_cache.py
+import functools
+import hashlib
+from typing import Any, Optional, Sequence
+
+import orjson
+from cachetools import TTLCache
+
+from .semantic_cache import SemanticCache
+
+
+@functools.lru_cache(maxsize=64)
+def _text_digest(text: str) -> bytes:
+    """Digest of a (long, usually constant) system instruction, hashed once."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Case and whitespace differences shouldn't defeat an exact-match hit."""
+    return " ".join(prompt.lower().split())
+
+
+class LLMCache:
+    """
+    In-process cache for structured LLM responses.
+
+    The exact tier keys on a hash of the model, the system instruction and the
+    normalized request prompt, so a model switch or an edited instruction never
+    serves a stale answer. With `semantic_threshold`, a second tier matches
+    near-duplicate requests by embedding (see SemanticCache), namespaced per
+    model and instruction.
+
+    Values are stored as JSON bytes and decoded on every hit, so callers may
+    mutate what they get back. Only use it for low-temperature structured
+    calls, where repeating the same prompt should give the same answer anyway.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: int = 3600,
+        semantic_threshold: Optional[float] = None,
+    ):
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._semantic = (
+            SemanticCache(threshold=semantic_threshold, maxsize=maxsize)
+            if semantic_threshold
+            else None
+        )
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return self._semantic is not None
+
+    @staticmethod
+    def make_key(model: str, system_instruction: str, prompt: str) -> bytes:
+        digest = hashlib.sha256(model.encode("utf-8"))
+        digest.update(_text_digest(system_instruction))
+        digest.update(_normalize_prompt(prompt).encode("utf-8"))
+        return digest.digest()
+
+    @staticmethod
+    def _semantic_namespace(model: str, system_instruction: str, namespace: str) -> str:
+        return f"{model}|{_text_digest(system_instruction).hex()}|{namespace}"
+
+    def get(self, model: str, system_instruction: str, prompt: str) -> Optional[Any]:
+        """Exact tier: a fresh copy of the cached response, or None on a miss."""
+        raw = self._entries.get(self.make_key(model, system_instruction, prompt))
+        if raw is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return orjson.loads(raw)
+
+    def has_similar(self, model: str, system_instruction: str, namespace: str = "") -> bool:
+        """Whether the semantic tier holds anything to compare against in `namespace`."""
+        return self._semantic is not None and self._semantic.has_entries(
+            self._semantic_namespace(model, system_instruction, namespace)
+        )
+
+    def get_similar(
+        self,
+        model: str,
+        system_instruction: str,
+        embedding: Sequence[float],
+        namespace: str = "",
+    ) -> Optional[Any]:
+        """
+        Semantic tier, consulted after an exact miss (so callers only pay for an
+        embedding when they need one; check has_similar first to skip waiting on
+        it when the namespace is empty). Hits are counted in `semantic_hits`.
+        """
+        if self._semantic is None:
+            return None
+
+        raw = self._semantic.lookup(
+            embedding, self._semantic_namespace(model, system_instruction, namespace)
+        )
+        if raw is None:
+            return None
+
+        self.semantic_hits += 1
+        return orjson.loads(raw)
+
+    def set(
+        self,
+        model: str,
+        system_instruction: str,
+        prompt: str,
+        value: Any,
+        embedding: Optional[Sequence[float]] = None,
+        namespace: str = "",
+    ) -> None:
+        raw = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        self._entries[self.make_key(model, system_instruction, prompt)] = raw
+
+        if self._semantic is not None and embedding is not None:
+            self._semantic.add(
+                embedding, raw, self._semantic_namespace(model, system_instruction, namespace)
+            )
@@ -0,0 +1,78 @@
+# ai_blog_writer/app/core/semantic_cache.py
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class _Bucket:
+    """Fixed-size ring buffer of unit vectors and their cached values."""
+
+    def __init__(self, maxsize: int, dim: int):
+        self.vectors = np.zeros((maxsize, dim), dtype=np.float32)
+        self.values: List[Any] = [None] * maxsize
+        self.count = 0
+        self.next = 0
+
+
+class SemanticCache:
+    """
+    In-process similarity cache keyed on embedding vectors.
+
+    A lookup returns the value stored for the most similar vector when its
+    cosine similarity reaches `threshold`. Entries are grouped by namespace
+    (e.g. language) and the oldest entry is overwritten once `maxsize` is hit.
+    Brute-force search over a contiguous matrix is sub-millisecond at these
+    sizes, so no ANN index is needed.
+    """
+
+    def __init__(self, threshold: float = 0.92, maxsize: int = 1024):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._buckets: Dict[str, _Bucket] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def has_entries(self, namespace: str = "") -> bool:
+        """Whether a lookup in `namespace` could hit (lets callers skip computing a vector)."""
+        bucket = self._buckets.get(namespace)
+        return bucket is not None and bucket.count > 0
+
+    def lookup(self, vector: Sequence[float], namespace: str = "") -> Optional[Any]:
+        """Return the cached value for the nearest vector, or None on a miss."""
+        bucket = self._buckets.get(namespace)
+        if bucket is None or bucket.count == 0:
+            self.misses += 1
+            return None
+
+        vec = self._normalize(vector)
+        if vec.shape[0] != bucket.vectors.shape[1]:
+            self.misses += 1
+            return None
+
+        similarities = bucket.vectors[: bucket.count] @ vec
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            self.hits += 1
+            return bucket.values[best]
+
+        self.misses += 1
+        return None
+
+    def add(self, vector: Sequence[float], value: Any, namespace: str = "") -> None:
+        """Store `value` under `vector`, evicting the oldest entry when full."""
+        vec = self._normalize(vector)
+        bucket = self._buckets.get(namespace)
+        if bucket is None or bucket.vectors.shape[1] != vec.shape[0]:
+            bucket = _Bucket(self.maxsize, vec.shape[0])
+            self._buckets[namespace] = bucket
+
+        bucket.vectors[bucket.next] = vec
+        bucket.values[bucket.next] = value
+        bucket.next = (bucket.next + 1) % self.maxsize
+        bucket.count = min(bucket.count + 1, self.maxsize)
@@ -1,5 +1,6 @@
 # ai_blog_writer/src/app/main.py
 import logging
+import time
 from contextlib import asynccontextmanager
 import asyncio
 
@@ -12,8 +13,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
 from .middleware.rate_limiter import RedisRateLimiterMiddleware
 from .core.exceptions import FormatterError, PipelineError, IntegrationError
+from .clients.http_client import close_http_client
 from .clients.redis_client import redis_client
 from .clients.supabase_client import supabase_client
+from .agents.media_agent import _PLAYWRIGHT_AVAILABLE
+from .agents.media_agent import warm_http_client as warm_media_http_client
+from .agents.review_agent import ReviewAgent
+from .core.content_pipeline import content_pipeline
 from .api.endpoints.generate_blog import router as generate_blog_router
 from .api.endpoints.suggest_blog_topics import router as suggest_topics_router
 import sys
@@ -21,6 +27,14 @@ import asyncio
 
 if sys.platform.startswith("win"):
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+else:
+    # libuv-based loop for the socket-heavy fan-out (uvicorn's "auto" loop picks it too)
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 # -----------------------------
 # Logging
@@ -39,7 +53,30 @@ print(f"🔍 [main.py] SUPABASE_SERVICE_ROLE_KEY: {settings.supabase_service_rol
 # Async helpers
 # -----------------------------
 async def async_supabase_connect():
-    await asyncio.to_thread(supabase_client.connect)
+    supabase_client.connect()
+    await supabase_client.connect_pool()
+
+
+async def _timed_warm_up(name: str, coro):
+    start = time.perf_counter()
+    try:
+        await coro
+        logger.info(f"🔥 Warmed {name} in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.warning(f"⚠️ Warm-up of {name} failed: {e}")
+
+
+async def warm_up():
+    """Pay cold-start costs (browser launch, TLS handshakes, dictionary loads) before traffic arrives."""
+    steps = [
+        _timed_warm_up("media HTTP client", warm_media_http_client()),
+        _timed_warm_up("readability scorer", asyncio.to_thread(ReviewAgent.warm_readability)),
+    ]
+    if _PLAYWRIGHT_AVAILABLE:
+        steps.append(
+            _timed_warm_up("screenshot browser", content_pipeline.media_agent._get_browser())
+        )
+    await asyncio.gather(*steps)
 
 
 @asynccontextmanager
@@ -58,6 +95,8 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Supabase connect failed: {e}")
 
+    await warm_up()
+
     yield
 
     logger.info("🛑 AI Blog Writer shutting down...")
@@ -67,6 +106,29 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Redis disconnect failed: {e}")
 
+    try:
+        await supabase_client.close()
+    except Exception as e:
+        logger.warning(f"⚠️ Supabase close failed: {e}")
+
+    try:
+        await content_pipeline.media_agent.close()
+        logger.info("✅ Screenshot browser closed")
+    except Exception as e:
+        logger.warning(f"⚠️ Screenshot browser close failed: {e}")
+
+    try:
+        await close_http_client()
+        logger.info("✅ Shared HTTP client closed")
+    except Exception as e:
+        logger.warning(f"⚠️ Shared HTTP client close failed: {e}")
+
+    try:
+        await asyncio.to_thread(ReviewAgent.close)
+        logger.info("✅ LanguageTool servers stopped")
+    except Exception as e:
+        logger.warning(f"⚠️ LanguageTool shutdown failed: {e}")
+
 
 # -----------------------------
 # FastAPI App
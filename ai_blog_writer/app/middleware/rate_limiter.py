@@ -1,11 +1,32 @@
 # ai_blog_writer/src/middleware/redis_rate_limiter.py
+import asyncio
+
 from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from functools import wraps 
 from typing import Callable, Optional
 
+from aiolimiter import AsyncLimiter
+
 from ..clients.redis_client import redis_client
 
+# In-process provider throttles: smooth bursts from concurrent blogs down to each
+# provider's quota instead of failing them with 429s
+# Gemini requests per minute; ai_rate_limit uses the same figure as the cross-process
+# backstop, so a request the in-process limiter lets through is not 429'd by Redis
+GEMINI_RPM = 500
+GEMINI_LIMITER = AsyncLimiter(GEMINI_RPM, 60)
+# Embedding calls have their own per-model quota and don't spend the generation budget
+GEMINI_EMBED_RPM = 1500
+GEMINI_EMBED_LIMITER = AsyncLimiter(GEMINI_EMBED_RPM, 60)
+YOUTUBE_LIMITER = AsyncLimiter(10_000, 86_400)
+# Cloudinary Admin API hourly quota (resource lookups); uploads are not counted against it
+CLOUDINARY_LIMITER = AsyncLimiter(500, 3600)
+
+# Cap on in-flight Gemini requests across all blogs (the limiters above bound the
+# rate, not how many slow generations are open at once)
+GEMINI_CONCURRENCY = asyncio.Semaphore(16)
+
 
 class RedisRateLimiterMiddleware(BaseHTTPMiddleware):
     """
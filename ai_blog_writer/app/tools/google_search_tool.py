@@ -3,9 +3,9 @@
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 import logging
-import httpx
 
 from ..clients.api_clients import serpapi_client  # relative import
+from ..clients.http_client import http_client
 from ..core.config import settings  # lowercase settings
 
 logger = logging.getLogger(__name__)
@@ -70,12 +70,11 @@ class GoogleSearchTool:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(
-                    "https://www.googleapis.com/customsearch/v1", params=params
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = await http_client.get(
+                "https://www.googleapis.com/customsearch/v1", params=params
+            )
+            response.raise_for_status()
+            data = response.json()
             return self._parse_gcs_results(data)
         except Exception as e:
             logger.error(f"Google Custom Search failed: {str(e)}")
@@ -0,0 +1,62 @@
+# ai_blog_writer/tests/test_strategy_agent.py
+import asyncio
+from unittest.mock import AsyncMock
+
+from app.agents import strategy_agent
+from app.agents.strategy_agent import (
+    CompetitorReport,
+    KeywordReport,
+    Outline,
+    ResearchEnrichment,
+    StrategyAgent,
+)
+
+# One valid reply per schema, shaped like gemini_client.generate_structured output
+_REPLIES = {
+    CompetitorReport: {
+        "competitors": [
+            {"name": "Example", "url": "https://example.com", "strengths": ["depth"], "weaknesses": ["dated"]}
+        ]
+    },
+    KeywordReport: {
+        "common_questions": ["What is technical SEO?"],
+        "semantic_keywords": ["site speed", "crawl budget"],
+    },
+    ResearchEnrichment: {
+        "content_gaps": ["No recent benchmarks"],
+        "search_intent": "informational",
+    },
+    Outline: {
+        "title": "Technical SEO Guide",
+        "structure": [{"heading": "Why it matters", "subheadings": [], "keywords": [], "estimated_length": 400}],
+        "meta_description": "A practical guide to technical SEO.",
+        "word_count_target": 3000,
+    },
+}
+
+
+async def _fake_generate_structured(prompt, cached_content=None, response_type=None, model=None):
+    # Fresh copies: the agent mutates the outline it gets back
+    return strategy_agent.orjson.loads(strategy_agent.orjson.dumps(_REPLIES[response_type]))
+
+
+def test_valid_structured_replies_do_not_fall_back(monkeypatch):
+    client = strategy_agent.gemini_client
+    monkeypatch.setattr(client, "generate_structured", AsyncMock(side_effect=_fake_generate_structured))
+    monkeypatch.setattr(client, "get_cached_content", AsyncMock(return_value=None))
+    monkeypatch.setattr(client, "embed", AsyncMock(side_effect=RuntimeError("no embeddings in tests")))
+    monkeypatch.setattr(strategy_agent, "_strategy_llm_cache", strategy_agent.LLMCache(maxsize=8, ttl=60))
+
+    strategy = asyncio.run(
+        StrategyAgent().generate_content_strategy(
+            topic="Technical SEO for small sites",
+            target_keyword="technical seo",
+            task_id="task-1",
+            url_id="url-1",
+        )
+    )
+
+    assert strategy.get("status") != "fallback_generated"
+    assert strategy["outline"]["title"] == "Technical SEO Guide"
+    assert strategy["semantic_keywords"] == ["site speed", "crawl budget"]
+    assert strategy["search_intent"] == "informational"